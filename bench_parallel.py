@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from subnetting_parallel import plan_parallel
+
+
+def make_jobs(count):
+    for i in range(count):
+        if i % 2:
+            yield {"mode": "CIDR", "ip_mask": f"{i % 223 + 1}.0.0.0/8", "extra_input": 65536}
+        else:
+            yield {"mode": "VLSM", "ip_mask": f"10.{i % 256}.0.0/16", "extra_input": [500, 300, 200, 100, 60, 30, 10] * 20}
+
+
+def measure(num_jobs, workers, ordered=True, chunk_size=16):
+    start = time.perf_counter()
+    subnets = errors = 0
+    for _, table, error in plan_parallel(make_jobs(num_jobs), workers=workers, ordered=ordered, chunk_size=chunk_size):
+        if error is None:
+            subnets += len(table)
+        else:
+            errors += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "jobs": num_jobs, "workers": workers, "ordered": ordered, "chunk_size": chunk_size,
+        "seconds": elapsed, "jobs_per_second": num_jobs / elapsed, "subnets_per_second": subnets / elapsed,
+        "errors": errors,
+    }
+
+
+def format_record(record):
+    return (f"{record['jobs']} jobs, {record['workers']:>3} workers, ordered={record['ordered']!s:<5} "
+            f"{record['seconds']:10.3f} s  {record['jobs_per_second']:8.1f} jobs/s  "
+            f"{record['subnets_per_second']:12.0f} subnets/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo thông lượng chia mạng song song bằng ProcessPoolExecutor.")
+    parser.add_argument("--jobs", type=int, default=400, help="Số yêu cầu mỗi lần đo")
+    parser.add_argument("--workers", type=int, action="append",
+                        help="Số tiến trình cần đo (mặc định: 1, 2, 4, ... tới số nhân CPU)")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("-o", "--output", help="Ghi kết quả ra file JSON")
+    args = parser.parse_args(argv)
+
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted(w for w in {1, 2, 4, 8, 16, 32, cpus} if w <= cpus)
+    runs = [(workers, True) for workers in worker_counts] + [(max(worker_counts), False)]
+    results = []
+    for workers, ordered in runs:
+        record = measure(args.jobs, workers, ordered, args.chunk_size)
+        results.append(record)
+        print(format_record(record))
+
+    if args.output:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "cpus": cpus,
+            },
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+# Với start method spawn (macOS/Windows) mỗi tiến trình con nạp lại module này,
+# nên phần chạy đo chỉ được thực hiện trong tiến trình chính
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from math import ceil
+
+from subnetting_server import PlanningServer, request
+
+REQUESTS = [
+    ("/cidr", {"ip_mask": "192.168.1.0/24", "extra_input": 4}),
+    ("/vlsm", {"ip_mask": "192.168.1.0/24", "extra_input": [60, 30, 10]}),
+    ("/details", {"ip_mask": "10.1.2.3/8"}),
+    ("/cidr", {"ip_mask": "10.0.0.0/8", "extra_input": 65536}),
+]
+
+
+async def worker(host, port, queue, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                path, payload = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, host, path, payload)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load_test(host, port, total, concurrency, mix):
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(mix[i % len(mix)])
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, queue, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(percent):
+        return latencies[max(0, ceil(percent / 100 * len(latencies)) - 1)] * 1e3
+
+    print(f"{total} yêu cầu, {concurrency} kết nối: {elapsed:.3f} s, {total / elapsed:.1f} req/s, lỗi: {len(errors)}")
+    print(f"Độ trễ (ms): p50 {percentile(50):.2f}  p95 {percentile(95):.2f}  p99 {percentile(99):.2f}  "
+          f"max {latencies[-1] * 1e3:.2f}  mean {statistics.mean(latencies) * 1e3:.2f}")
+
+
+async def run(args):
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        server = PlanningServer(host, 0, args.workers)
+        await server.start()
+        port = server.port
+    try:
+        mix = REQUESTS if args.heavy else REQUESTS[:3]
+        await load_test(host, port, args.requests, args.concurrency, mix)
+        if server is not None:
+            print(f"Yêu cầu được gộp: {server.coalesced}")
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo độ trễ/thông lượng của dịch vụ chia mạng trên localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Cổng của server đang chạy (mặc định: tự khởi động server)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("--heavy", action="store_true", help="Thêm yêu cầu chia /8 thành 65536 mạng con")
+    asyncio.run(run(parser.parse_args(argv)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import argparse
+import ipaddress
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from math import ceil
+
+import subnetting
+import subnetting_engine
+import subnetting_lib
+import subnetting_summary
+
+# Kết quả của --calibrate ghi bằng -o dùng làm dữ liệu hiệu chỉnh cho chế độ engine auto (SUBNETTING_CALIBRATION)
+ENGINES = {name: engine.module for name, engine in subnetting_engine.ENGINES.items()}
+
+QUICK_GRID = {
+    "prefixes": (8, 16, 24, 30),
+    "subnet_counts": (4, 256, 4096),
+    "vlsm_sizes": (10, 1000),
+    "summary_sizes": (10000,),
+}
+
+FULL_GRID = {
+    "prefixes": tuple(range(8, 31)),
+    "subnet_counts": (1, 16, 256, 4096, 65536, 1000000),
+    "vlsm_sizes": (10, 1000, 10000, 100000),
+    "summary_sizes": (10000, 100000, 1000000),
+}
+
+
+def host_requirements(prefix, size, seed=0):
+    max_hosts = (1 << (32 - prefix)) // (size * 4) - 2
+    if max_hosts < 2:
+        return None
+    rng = random.Random(seed + prefix * 1000003 + size)
+    return [rng.randint(2, max_hosts) for _ in range(size)]
+
+
+def route_prefixes(size, seed=0):
+    rng = random.Random(seed + size)
+    prefixes = []
+    for _ in range(size):
+        prefix = rng.randint(16, 32)
+        prefixes.append((rng.getrandbits(32) & ~((1 << (32 - prefix)) - 1) & 0xFFFFFFFF, prefix))
+    return prefixes
+
+
+def cases(grid):
+    for prefix in grid["prefixes"]:
+        yield "details", prefix, 1000, None
+        for count in grid["subnet_counts"]:
+            if count <= 1 << (30 - prefix):
+                yield "cidr", prefix, count, None
+        for size in grid["vlsm_sizes"]:
+            requirements = host_requirements(prefix, size)
+            if requirements is not None:
+                yield "vlsm", prefix, size, requirements
+    for size in grid.get("summary_sizes", ()):
+        yield "summary", 0, size, route_prefixes(size)
+
+
+def make_callable(engine, case, prefix, size, requirements):
+    ip = "10.0.0.0"
+    if case == "details":
+        subnet = engine.Subnetting(ip, prefix)
+
+        def run():
+            for _ in range(size):
+                subnet.get_network_details()
+    elif case == "cidr":
+        def run():
+            engine.CIDR(ip, prefix).calculate_subnets(size)
+    elif case == "summary" and engine is subnetting_lib:
+        networks = [ipaddress.IPv4Network(network) for network in requirements]
+
+        def run():
+            list(ipaddress.collapse_addresses(networks))
+    elif case == "summary":
+        table = subnetting.SubnetTable.from_prefixes(requirements)
+
+        def run():
+            subnetting_summary.summarize(table)
+    else:
+        def run():
+            engine.VLSM(ip, prefix).calculate_subnets(list(requirements))
+    return run
+
+
+def make_table_callable(name, case, prefix, size, requirements):
+    # Đo đúng đường engine auto chạy: sinh toàn bộ kết quả theo từng SubnetTable
+    engine = subnetting_engine.ENGINES[name]
+    argument = size if case == "cidr" else requirements
+
+    def run():
+        for _ in engine.iter_tables(case, "10.0.0.0", prefix, list(argument) if case == "vlsm" else argument):
+            pass
+    return run
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(0, ceil(percent / 100 * len(values)) - 1)]
+
+
+def measure(run, repeat, warmup):
+    for _ in range(warmup):
+        run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "median": statistics.median(times),
+        "p95": percentile(times, 95),
+        "peak_bytes": peak,
+    }
+
+
+def run_suite(engines, grid, repeat=5, warmup=1, log=None, tables=False):
+    results = []
+    for case, prefix, size, requirements in cases(grid):
+        for name in engines:
+            record = {"engine": name, "case": case, "prefix": prefix, "size": size}
+            if tables and case in ("cidr", "vlsm"):
+                record["path"] = "tables"
+                run = make_table_callable(name, case, prefix, size, requirements)
+            else:
+                run = make_callable(ENGINES[name], case, prefix, size, requirements)
+            try:
+                record.update(measure(run, repeat, warmup))
+            except ValueError as e:
+                record["error"] = str(e)
+            results.append(record)
+            if log:
+                log(format_record(record))
+    return results
+
+
+def format_record(record):
+    label = f"{record['engine']:<16} {record['case']:<8} /{record['prefix']:<3} n={record['size']:<8}"
+    if "error" in record:
+        return f"{label} error: {record['error']}"
+    return (f"{label} median {record['median'] * 1e3:10.3f} ms  p95 {record['p95'] * 1e3:10.3f} ms  "
+            f"peak {record['peak_bytes'] / 1024:10.1f} KiB")
+
+
+def record_key(record):
+    return record["engine"], record["case"], record["prefix"], record["size"], record.get("path")
+
+
+def compare(results, baseline, tolerance=0.25, noise=0.001):
+    previous = {record_key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get(record_key(record))
+        if old is None or "error" in record or "error" in old:
+            continue
+        if (record["median"] > old["median"] * (1 + tolerance)
+                and record["median"] - old["median"] > noise):
+            regressions.append((record, "median", old["median"], record["median"]))
+        if record["peak_bytes"] > old["peak_bytes"] * (1 + tolerance) + 4096:
+            regressions.append((record, "peak_bytes", old["peak_bytes"], record["peak_bytes"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark các engine chia mạng CIDR/VLSM.")
+    parser.add_argument("--engine", action="append", choices=ENGINES, help="Engine cần đo (mặc định: tất cả)")
+    parser.add_argument("--full", action="store_true", help="Chạy lưới tham số đầy đủ (/8-/30, tới 1e6 subnet)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("-o", "--output", help="Ghi kết quả ra file JSON")
+    parser.add_argument("--baseline", help="So sánh với file JSON kết quả trước đó")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Mức chậm hơn cho phép so với baseline")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Đo CIDR/VLSM qua iter_tables của engine; ghi bằng -o làm dữ liệu cho SUBNETTING_CALIBRATION")
+    args = parser.parse_args(argv)
+
+    engines = args.engine or list(ENGINES)
+    grid = FULL_GRID if args.full else QUICK_GRID
+    results = run_suite(engines, grid, args.repeat, args.warmup, log=print, tables=args.calibrate)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for record, metric, old, new in regressions:
+            print(f"REGRESSION {format_record(record)}: {metric} {old:.6g} -> {new:.6g}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,150 +1,537 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from itertools import groupby, islice
+from math import ceil
+import os
+
+try:
+    import subnetting_batch
+except ImportError:
+    subnetting_batch = None
+
+BATCH_THRESHOLD = 4096
+
+NETWORK_KEY = "Địa chỉ mạng"
+RANGE_KEY = "Dải địa chỉ"
+BROADCAST_KEY = "Địa chỉ broadcast"
+HOSTS_KEY = "Số lượng host"
+DETAIL_KEYS = (NETWORK_KEY, RANGE_KEY, BROADCAST_KEY, HOSTS_KEY)
+
 class IPAddressConvert:
     @staticmethod
-    def ip_to_binary(ip): 
-        octets = ip.split('.')        
-        binary_ip = ''
-
-        for octet in octets:
-            num = int(octet)
-            binary = ''
-            i = 0
-            while num > 0:
-                binary = str(num % 2) + binary
-                num //= 2
-                i += 1
-            if i != 8:
-                binary= '0' * (8-i) + binary
-            binary_ip += binary
-        return binary_ip
-    
+    def ip_to_int(ip):
+        a, b, c, d = ip.split('.')
+        return (int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)
+
+    @staticmethod
+    def int_to_ip(value):
+        return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+    @staticmethod
+    def ip_to_binary(ip):
+        return format(IPAddressConvert.ip_to_int(ip), '032b')
+
     @staticmethod
     def binary_to_ip(binary_ip):
-        ip = ''
-        for i in range(0, 32, 8):
-            binary_octet = binary_ip[i:i + 8]
-            decimal = 0
-            for bit in binary_octet:
-                decimal = decimal * 2 + int(bit) 
-            ip += str(decimal) + '.'        
-        return ip[:-1] 
+        return IPAddressConvert.int_to_ip(int(binary_ip[:32], 2))
 
     @staticmethod
     def binary_to_decimal(binary):
-        decimal = 0
-        for bit in binary:
-            decimal = decimal * 2 + int(bit)
-        return decimal
+        return int(binary, 2) if binary else 0
 
     @staticmethod
     def decimal_to_binary(decimal):
-        binary = ''
-        i = 0
-        while decimal > 0:
-            binary = str(decimal % 2) + binary
-            decimal //= 2
-            i += 1
-        if i != 32:
-            binary= '0' * (32-i) + binary        
-        return binary
+        return format(decimal, '032b')
 
 class CalculatorAddressConvert:
+    @staticmethod
+    def host_mask(mask):
+        return (1 << (32 - mask)) - 1
+
+    @staticmethod
+    def network_mask(mask):
+        return 0xFFFFFFFF ^ CalculatorAddressConvert.host_mask(mask)
+
+    @staticmethod
+    def network_int(ip_int, mask):
+        return ip_int & CalculatorAddressConvert.network_mask(mask)
+
+    @staticmethod
+    def broadcast_int(ip_int, mask):
+        return ip_int | CalculatorAddressConvert.host_mask(mask)
+
+    @staticmethod
+    def num_hosts(mask):
+        # /31 (RFC 3021) và /32 không có địa chỉ mạng/broadcast riêng
+        return (1 << (32 - mask)) - 2 if mask < 31 else 1 << (32 - mask)
+
+    @staticmethod
+    def host_range(network_int, mask):
+        if mask < 31:
+            return network_int + 1, (network_int | CalculatorAddressConvert.host_mask(mask)) - 1
+        return network_int, network_int | CalculatorAddressConvert.host_mask(mask)
+
     @staticmethod
     def calculate_network_address(ip, mask):
-        ip_binary = IPAddressConvert.ip_to_binary(ip)
-        network_binary = ip_binary[:mask] + '0' * (32 - mask)
-        return IPAddressConvert.binary_to_ip(network_binary)
+        ip_int = IPAddressConvert.ip_to_int(ip)
+        return IPAddressConvert.int_to_ip(CalculatorAddressConvert.network_int(ip_int, int(mask)))
     
     @staticmethod
     def calculate_broadcast_address(ip, mask):
-        ip_binary = IPAddressConvert.ip_to_binary(ip)
-        broadcast_binary = ip_binary[:mask] + '1' * (32 - mask)
-        return IPAddressConvert.binary_to_ip(broadcast_binary)
+        ip_int = IPAddressConvert.ip_to_int(ip)
+        return IPAddressConvert.int_to_ip(CalculatorAddressConvert.broadcast_int(ip_int, int(mask)))
 
-class Subnetting:
+class Subnetting(IPAddressConvert):
     def __init__(self, ip, mask):
         self.ip = ip
         self.mask = int(mask)
-        self.network_address = CalculatorAddressConvert.calculate_network_address(ip, mask)
-        self.broadcast_address = CalculatorAddressConvert.calculate_broadcast_address(ip, mask)
+        self.ip_int = ip if isinstance(ip, int) else IPAddressConvert.ip_to_int(ip)
+        self.network_int = CalculatorAddressConvert.network_int(self.ip_int, self.mask)
+        self.broadcast_int = CalculatorAddressConvert.broadcast_int(self.ip_int, self.mask)
+
+    @property
+    def network_address(self):
+        return IPAddressConvert.int_to_ip(self.network_int)
+
+    @property
+    def broadcast_address(self):
+        return IPAddressConvert.int_to_ip(self.broadcast_int)
 
     def floor_log2(self, x):
-        k = 0
-        while (1 << k) <= x:
-            k += 1
-        return k - 1
+        return int(x).bit_length() - 1
     
     def ceil_log2(self, x):
-        k = 0
-        while (1 << k) < x:
-            k += 1
-        return k
+        if x <= 1:
+            return 0
+        return (ceil(x) - 1).bit_length()
 
     def calculate_num_hosts(self, mask):
-        return (2 ** (32 - mask)) - 2
-
-    def get_network_details(self):
-        first_host_decimal = IPAddressConvert.binary_to_decimal(IPAddressConvert.ip_to_binary(self.network_address)) + 1
-        last_host_decimal = IPAddressConvert.binary_to_decimal(IPAddressConvert.ip_to_binary(self.broadcast_address)) - 1
+        return CalculatorAddressConvert.num_hosts(mask)
 
+    @staticmethod
+    def details(network_int, mask):
+        int_to_ip = IPAddressConvert.int_to_ip
+        broadcast_int = network_int | CalculatorAddressConvert.host_mask(mask)
+        if mask < 31:
+            first_host, last_host, num_hosts = network_int + 1, broadcast_int - 1, (1 << (32 - mask)) - 2
+        else:
+            # /31 (RFC 3021) và /32 không có địa chỉ mạng/broadcast riêng
+            first_host, last_host, num_hosts = network_int, broadcast_int, 1 << (32 - mask)
         return {
-            "Địa chỉ mạng": f"{self.network_address}/{self.mask}",
-            "Dải địa chỉ": f"{IPAddressConvert.binary_to_ip(IPAddressConvert.decimal_to_binary(first_host_decimal))} - "
-                           f"{IPAddressConvert.binary_to_ip(IPAddressConvert.decimal_to_binary(last_host_decimal))}",
-            "Địa chỉ broadcast": self.broadcast_address,
-            "Số lượng host": self.calculate_num_hosts(self.mask),
+            NETWORK_KEY: f"{int_to_ip(network_int)}/{mask}",
+            RANGE_KEY: f"{int_to_ip(first_host)} - {int_to_ip(last_host)}",
+            BROADCAST_KEY: int_to_ip(broadcast_int),
+            HOSTS_KEY: num_hosts,
         }
 
+    def get_network_details(self):
+        return self.details(self.network_int, self.mask)
+
+class SubnetRow(Mapping):
+    __slots__ = ('_table', 'index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self.index = index
+
+    @property
+    def network_int(self):
+        return self._table.networks[self.index]
+
+    @property
+    def prefix_length(self):
+        return self._table.prefixes[self.index]
+
+    @property
+    def broadcast_int(self):
+        return self.network_int | CalculatorAddressConvert.host_mask(self.prefix_length)
+
+    @property
+    def num_hosts(self):
+        return CalculatorAddressConvert.num_hosts(self.prefix_length)
+
+    def __getitem__(self, key):
+        int_to_ip = IPAddressConvert.int_to_ip
+        if key == NETWORK_KEY:
+            return f"{int_to_ip(self.network_int)}/{self.prefix_length}"
+        if key == RANGE_KEY:
+            first_host, last_host = CalculatorAddressConvert.host_range(self.network_int, self.prefix_length)
+            return f"{int_to_ip(first_host)} - {int_to_ip(last_host)}"
+        if key == BROADCAST_KEY:
+            return int_to_ip(self.broadcast_int)
+        if key == HOSTS_KEY:
+            return self.num_hosts
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(DETAIL_KEYS)
+
+    def __len__(self):
+        return len(DETAIL_KEYS)
+
+    def to_dict(self):
+        return Subnetting.details(self.network_int, self.prefix_length)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+class SubnetTable:
+    __slots__ = ('networks', 'prefixes')
+
+    def __init__(self, networks=(), prefixes=()):
+        self.networks = networks if isinstance(networks, array) else array('I', networks)
+        self.prefixes = prefixes if isinstance(prefixes, array) else array('B', prefixes)
+        if len(self.networks) != len(self.prefixes):
+            raise ValueError("Số địa chỉ mạng và số mặt nạ không khớp.")
+
+    @classmethod
+    def from_prefixes(cls, prefixes):
+        if isinstance(prefixes, SubnetTable):
+            return prefixes
+        table = cls()
+        for prefix in prefixes:
+            if isinstance(prefix, Mapping):
+                prefix = prefix[NETWORK_KEY]
+            if isinstance(prefix, str):
+                ip, _, mask = prefix.partition('/')
+                prefix = (IPAddressConvert.ip_to_int(ip), int(mask) if mask else 32)
+            network_int, prefix_length = prefix
+            table.append(CalculatorAddressConvert.network_int(network_int, prefix_length), prefix_length)
+        return table
+
+    @classmethod
+    def frombytes(cls, networks, prefixes):
+        table = cls()
+        table.networks.frombytes(networks)
+        table.prefixes.frombytes(prefixes)
+        return table
+
+    def tobytes(self):
+        return self.networks.tobytes(), self.prefixes.tobytes()
+
+    def append(self, network_int, prefix_length):
+        self.networks.append(network_int)
+        self.prefixes.append(prefix_length)
+
+    def __len__(self):
+        return len(self.networks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SubnetTable(self.networks[index], self.prefixes[index])
+        if index < 0:
+            index += len(self.networks)
+        if not 0 <= index < len(self.networks):
+            raise IndexError("SubnetTable index out of range")
+        return SubnetRow(self, index)
+
+    def __iter__(self):
+        return (SubnetRow(self, i) for i in range(len(self.networks)))
+
+    @property
+    def nbytes(self):
+        return (len(self.networks) * self.networks.itemsize
+                + len(self.prefixes) * self.prefixes.itemsize)
+
+    def broadcasts(self):
+        host_mask = CalculatorAddressConvert.host_mask
+        return array('I', (n | host_mask(p) for n, p in zip(self.networks, self.prefixes)))
+
+    def num_hosts(self):
+        num_hosts = CalculatorAddressConvert.num_hosts
+        return [num_hosts(p) for p in self.prefixes]
+
+    def to_columns(self):
+        if subnetting_batch is not None and len(self) >= BATCH_THRESHOLD:
+            np = subnetting_batch.np
+            return subnetting_batch.details_columns(
+                np.frombuffer(self.networks, dtype=np.uint32),
+                np.frombuffer(self.prefixes, dtype=np.uint8),
+            )
+        rows = [Subnetting.details(n, p) for n, p in zip(self.networks, self.prefixes)]
+        return tuple([row[key] for row in rows] for key in DETAIL_KEYS)
+
+    def to_dicts(self):
+        if subnetting_batch is not None and len(self) >= BATCH_THRESHOLD:
+            np = subnetting_batch.np
+            return subnetting_batch.details_to_dicts(
+                np.frombuffer(self.networks, dtype=np.uint32),
+                np.frombuffer(self.prefixes, dtype=np.uint8),
+            )
+        details = Subnetting.details
+        return [details(n, p) for n, p in zip(self.networks, self.prefixes)]
+
+class SubnetPlan(Sequence):
+    # Kế hoạch chia mạng dạng dãy lười: các mạng con cùng prefix nằm liền nhau
+    # được gom thành một "đoạn", mạng con thứ i được tính trực tiếp từ đoạn chứa nó
+    def __init__(self, run_starts, run_networks, run_prefixes, size, bits=32,
+                 details=None, parse=None, positions=None):
+        self.run_starts = run_starts
+        self.run_networks = run_networks
+        self.run_prefixes = run_prefixes
+        self.size = size
+        self.bits = bits
+        self.details = details or Subnetting.details
+        self.parse = parse or IPAddressConvert.ip_to_int
+        self.positions = range(size) if positions is None else positions
+
+    @classmethod
+    def from_blocks(cls, blocks, bits=32, details=None, parse=None):
+        run_starts, run_networks, run_prefixes = [], [], []
+        size = 0
+        expected = None
+        for network_int, prefix_length in blocks:
+            if network_int != expected or prefix_length != run_prefixes[-1]:
+                run_starts.append(size)
+                run_networks.append(network_int)
+                run_prefixes.append(prefix_length)
+            size += 1
+            expected = network_int + (1 << (bits - prefix_length))
+        return cls(run_starts, run_networks, run_prefixes, size, bits, details, parse)
+
+    @property
+    def count(self):
+        positions = self.positions
+        if positions.step > 0:
+            return max(0, (positions.stop - positions.start + positions.step - 1) // positions.step)
+        return max(0, (positions.start - positions.stop - positions.step - 1) // -positions.step)
+
+    def __len__(self):
+        return self.count
+
+    def block(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("SubnetPlan index out of range")
+        position = self.positions[index]
+        run = bisect_right(self.run_starts, position) - 1
+        prefix_length = self.run_prefixes[run]
+        offset = (position - self.run_starts[run]) << (self.bits - prefix_length)
+        return self.run_networks[run] + offset, prefix_length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SubnetPlan(self.run_starts, self.run_networks, self.run_prefixes, self.size, self.bits,
+                              self.details, self.parse, self.positions[index])
+        return self.details(*self.block(index))
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.details(*self.block(i))
+
+    def index_of(self, address):
+        address_int = address if isinstance(address, int) else self.parse(address.partition('/')[0])
+        run = bisect_right(self.run_networks, address_int) - 1
+        if run >= 0:
+            host_bits = self.bits - self.run_prefixes[run]
+            position = self.run_starts[run] + ((address_int - self.run_networks[run]) >> host_bits)
+            run_end = self.run_starts[run + 1] if run + 1 < len(self.run_starts) else self.size
+            if position < run_end and position in self.positions:
+                return self.positions.index(position)
+        raise ValueError(f"{address} không thuộc kế hoạch chia mạng.")
+
+    def __contains__(self, address):
+        try:
+            self.index_of(address)
+        except ValueError:
+            return False
+        return True
+
+    def to_table(self):
+        table = SubnetTable()
+        for i in range(self.count):
+            table.append(*self.block(i))
+        return table
+
 class CIDR(Subnetting):
     def __init__(self, ip, mask):
         super().__init__(ip, mask)
         self.prefix_length = None
 
     def calculate_subnets(self, num_subnets):
-        total = self.calculate_num_hosts(self.mask) + 2      
-        if self.floor_log2(total/num_subnets) < 2:
+        return self.subnet_table(num_subnets).to_dicts()
+
+    def subnet_table(self, num_subnets):
+        prefix_length = self.split_prefix(num_subnets)
+        return SubnetTable(self._networks(0, num_subnets, prefix_length), array('B', [prefix_length]) * num_subnets)
+
+    def iter_tables(self, num_subnets, chunk_size=4096):
+        return self._iter_tables(num_subnets, chunk_size, self.split_prefix(num_subnets))
+
+    def plan(self, num_subnets):
+        return SubnetPlan([0], [self.network_int], [self.split_prefix(num_subnets)], num_subnets)
+
+    def _iter_tables(self, num_subnets, chunk_size, prefix_length):
+        for start in range(0, num_subnets, chunk_size):
+            stop = min(num_subnets, start + chunk_size)
+            yield SubnetTable(self._networks(start, stop, prefix_length), array('B', [prefix_length]) * (stop - start))
+
+    def _networks(self, start, stop, prefix_length):
+        subnet_size = 1 << (32 - prefix_length)
+        first = self.network_int + start * subnet_size
+        if subnetting_batch is not None and stop - start >= BATCH_THRESHOLD:
+            networks = array('I')
+            networks.frombytes(subnetting_batch.subnet_bases(first, prefix_length, stop - start).tobytes())
+            return networks
+        return array('I', range(first, first + (stop - start) * subnet_size, subnet_size))
+
+    def iter_subnets(self, num_subnets, start=0, count=None):
+        prefix_length = self.split_prefix(num_subnets)
+        stop = num_subnets if count is None else min(num_subnets, start + count)
+        return self._iter_subnets(start, stop, prefix_length)
+
+    def split_prefix(self, num_subnets):
+        total = 1 << (32 - self.mask)
+        host_bits = self.floor_log2(total // num_subnets)
+        if host_bits < 2:
             raise ValueError(f"Không thể chia vì với {num_subnets} mạng con thì mỗi mạng có 0 địa chỉ khả dụng .")
         else:
-            self.prefix_length = 32 - self.floor_log2(total/num_subnets)        
-        subnets = []
-        subnet_size = 2 ** (32 - self.prefix_length)
+            self.prefix_length = 32 - host_bits
+        return self.prefix_length
 
-        for i in range(num_subnets):
-            network_decimal = IPAddressConvert.binary_to_decimal(IPAddressConvert.ip_to_binary(self.network_address)) + i * subnet_size
-            subnet_ip = IPAddressConvert.binary_to_ip(IPAddressConvert.decimal_to_binary(network_decimal))
-            subnet = Subnetting(subnet_ip, self.prefix_length)
-            subnets.append(subnet.get_network_details())
-        return subnets
+    def _iter_subnets(self, start, stop, prefix_length):
+        subnet_size = 1 << (32 - prefix_length)
+        details = self.details
+        for i in range(start, stop):
+            yield details(self.network_int + i * subnet_size, prefix_length)
 
 class VLSM(Subnetting):
-    def __init__(self, ip, mask):
+    def __init__(self, ip, mask, packed=False):
         super().__init__(ip, mask)
         self.prefix_length = None
         self.available_network = None
+        self.packed = packed
         
     def calculate_subnets(self, host_requirements):
+        return self.subnet_table(host_requirements).to_dicts()
+
+    def subnet_table(self, host_requirements):
+        self.sort_requirements(host_requirements)
+        table = SubnetTable()
+        if self.packed:
+            for network_int, prefix_length, count in self._packed_groups(host_requirements):
+                subnet_size = 1 << (32 - prefix_length)
+                table.networks.extend(range(network_int, network_int + count * subnet_size, subnet_size))
+                table.prefixes.extend(array('B', [prefix_length]) * count)
+            return table
+        for network_int, prefix_length in self._iter_blocks(host_requirements):
+            table.append(network_int, prefix_length)
+        return table
+
+    def usage(self, host_requirements, table):
+        allocated = sum(1 << (32 - prefix_length) for prefix_length in table.prefixes)
+        requested = sum(host_requirements)
+        usable = sum(table.num_hosts())
+        return {
+            "requested_hosts": requested,
+            "allocated_addresses": allocated,
+            "wasted_addresses": usable - requested,
+            "free_addresses": (1 << (32 - self.mask)) - allocated,
+            "utilization": requested / allocated if allocated else 0.0,
+        }
+
+    def iter_tables(self, host_requirements, chunk_size=4096):
+        self.sort_requirements(host_requirements)
+        return self._iter_tables(host_requirements, chunk_size)
+
+    def plan(self, host_requirements):
+        self.sort_requirements(host_requirements)
+        if self.packed:
+            run_starts, run_networks, run_prefixes = [], [], []
+            start = 0
+            for network_int, prefix_length, count in self._packed_groups(host_requirements):
+                run_starts.append(start)
+                run_networks.append(network_int)
+                run_prefixes.append(prefix_length)
+                start += count
+            return SubnetPlan(run_starts, run_networks, run_prefixes, len(host_requirements))
+        return SubnetPlan.from_blocks(self._iter_blocks(host_requirements))
+
+    def _iter_tables(self, host_requirements, chunk_size):
+        table = SubnetTable()
+        for network_int, prefix_length in self._iter_blocks(host_requirements):
+            table.append(network_int, prefix_length)
+            if len(table) == chunk_size:
+                yield table
+                table = SubnetTable()
+        if len(table):
+            yield table
+
+    def iter_blocks(self, host_requirements):
+        self.sort_requirements(host_requirements)
+        return self._iter_blocks(host_requirements)
+
+    def iter_subnets(self, host_requirements, start=0, count=None):
+        self.sort_requirements(host_requirements)
+        stop = None if count is None else start + count
+        blocks = islice(self._iter_blocks(host_requirements), start, stop)
+        details = self.details
+        return (details(network_int, prefix_length) for network_int, prefix_length in blocks)
+
+    def sort_requirements(self, host_requirements):
         host_requirements.sort(reverse=True)
-        subnets = []
-        self.available_network = self.network_address
+        if host_requirements and 32 - self.ceil_log2(host_requirements[0] + 2) < self.mask:
+            raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+        # Ở cả hai chế độ các khối xếp liền nhau và thẳng hàng nên chỉ cần so tổng kích thước với mạng cha,
+        # kiểm tra trước khi sinh kết quả để lỗi không xuất hiện giữa chừng
+        if self.packed:
+            total = sum(1 << self.ceil_log2(hosts + 2) for hosts in host_requirements)
+        else:
+            total = sum(1 << (32 - prefix_length) for prefix_length in self._legacy_prefixes(host_requirements))
+        if total > 1 << (32 - self.mask):
+            raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+
+    def _packed_groups(self, host_requirements):
+        # Chế độ đóng gói: mỗi yêu cầu nhận khối nhỏ nhất vừa đủ. Các yêu cầu đã
+        # sắp giảm dần nên các khối cùng prefix nằm liền nhau và luôn thẳng hàng
+        available = self.network_int
+        end = self.broadcast_int + 1
+        prefixes = (32 - self.ceil_log2(hosts + 2) for hosts in host_requirements)
+        for prefix_length, group in groupby(prefixes):
+            count = sum(1 for _ in group)
+            if prefix_length < self.mask or available + (count << (32 - prefix_length)) > end:
+                raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+            yield available, prefix_length, count
+            available += count << (32 - prefix_length)
+            self.prefix_length = prefix_length
+        self.available_network = available
+
+    def _iter_blocks(self, host_requirements):
+        if self.packed:
+            return (
+                (network_int + (i << (32 - prefix_length)), prefix_length)
+                for network_int, prefix_length, count in self._packed_groups(host_requirements)
+                for i in range(count)
+            )
+        return self._iter_legacy_blocks(host_requirements)
 
+    def _legacy_prefixes(self, host_requirements):
+        prefix_length = None
         for i, hosts in enumerate(host_requirements):
             if i>=1:
                 prefix_new = 32 - self.ceil_log2(hosts+2)
-                prefix_old = self.prefix_length
+                prefix_old = prefix_length
                 if (prefix_new == prefix_old or prefix_new - prefix_old==1):
-                    self.prefix_length = prefix_old
+                    prefix_length = prefix_old
                 else:
-                    self.prefix_length = prefix_new 
+                    prefix_length = prefix_new 
             else:
                 required_size = self.ceil_log2(hosts+2)
-                self.prefix_length = 32 - required_size
-            if 2**(32 - self.prefix_length) > 2**(32 - self.mask):
-                raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")            
-            subnet = Subnetting(self.available_network, self.prefix_length)
-            subnets.append(subnet.get_network_details())
+                prefix_length = 32 - required_size
+            yield prefix_length
 
-            next_network_decimal = IPAddressConvert.binary_to_decimal(IPAddressConvert.ip_to_binary(subnet.broadcast_address)) + 1
-            self.available_network = IPAddressConvert.binary_to_ip(IPAddressConvert.decimal_to_binary(next_network_decimal))
-        return subnets
+    def _iter_legacy_blocks(self, host_requirements):
+        self.available_network = self.network_int
+
+        for prefix_length in self._legacy_prefixes(host_requirements):
+            self.prefix_length = prefix_length
+            # sort_requirements đã kiểm tra tổng kích thước nên khối luôn nằm trong mạng cha
+            assert (self.prefix_length >= self.mask
+                    and self.available_network + (1 << (32 - self.prefix_length)) <= self.broadcast_int + 1)
+            yield self.available_network, self.prefix_length
+            self.available_network += 1 << (32 - self.prefix_length)
 
 def is_ip(ip):
     octets = ip.split('.')
@@ -158,6 +545,11 @@ def is_ip(ip):
 def is_mask(mask):
     return 0 < int(mask) <= 32
 
+# SUBNETTING_PROFILE=<tiền tố tệp> bật đo đạc khi nạp thư viện, kết quả ghi ra khi thoát
+if os.environ.get("SUBNETTING_PROFILE") and __name__ != "__main__":
+    import subnetting_profile
+    subnetting_profile.enable_from_env()
+
 if __name__ == "__main__":
     mode = input("Chọn chế độ (CIDR/VLSM): ").strip().upper()
     ip_mask = input("Nhập địa chỉ IP và mặt nạ mạng (VD: 192.168.1.0/24): ").strip()
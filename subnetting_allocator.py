@@ -0,0 +1,220 @@
+from heapq import heappush, heappop
+
+from subnetting import Subnetting, SubnetTable, IPAddressConvert, NETWORK_KEY
+
+
+class SubnetAllocator(Subnetting):
+    def __init__(self, ip, mask):
+        super().__init__(ip, mask)
+        # Danh sách khối trống theo từng độ dài prefix (buddy system)
+        self.free = {prefix: set() for prefix in range(self.mask, 33)}
+        self.free_heaps = {prefix: [] for prefix in range(self.mask, 33)}
+        self.allocated = {}
+        self.free_addresses = 1 << (32 - self.mask)
+        self._push(self.mask, self.network_int)
+
+    def _push(self, prefix, network_int):
+        free, heap = self.free[prefix], self.free_heaps[prefix]
+        free.add(network_int)
+        heappush(heap, network_int)
+        if len(heap) > 2 * len(free) + 64:
+            heap[:] = sorted(free)
+
+    def _pop(self, prefix):
+        free, heap = self.free[prefix], self.free_heaps[prefix]
+        while heap:
+            network_int = heappop(heap)
+            if network_int in free:
+                free.remove(network_int)
+                return network_int
+        return None
+
+    def allocate(self, hosts):
+        return self.allocate_prefix(32 - self.ceil_log2(hosts + 2))
+
+    def allocate_prefix(self, prefix_length):
+        prefix_length = int(prefix_length)
+        return self.details(self.allocate_block(prefix_length), prefix_length)
+
+    def allocate_block(self, prefix_length):
+        return self._allocate(int(prefix_length))
+
+    def _allocate(self, prefix_length):
+        if not self.mask <= prefix_length <= 32:
+            raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+        prefix = prefix_length
+        while prefix >= self.mask and not self.free[prefix]:
+            prefix -= 1
+        if prefix < self.mask:
+            raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+
+        network_int = self._pop(prefix)
+        while prefix < prefix_length:
+            prefix += 1
+            self._push(prefix, network_int + (1 << (32 - prefix)))
+
+        self.allocated[network_int] = prefix_length
+        self.free_addresses -= 1 << (32 - prefix_length)
+        return network_int
+
+    def reserve(self, network_int, prefix_length):
+        prefix_length = int(prefix_length)
+        network_int &= 0xFFFFFFFF ^ ((1 << (32 - prefix_length)) - 1)
+        prefix = prefix_length
+        block = network_int
+        while prefix >= self.mask and block not in self.free[prefix]:
+            prefix -= 1
+            block &= 0xFFFFFFFF ^ ((1 << (32 - prefix)) - 1)
+        if prefix < self.mask:
+            raise ValueError(f"{IPAddressConvert.int_to_ip(network_int)}/{prefix_length} đã được sử dụng "
+                             "hoặc nằm ngoài mạng.")
+
+        self.free[prefix].remove(block)
+        while prefix < prefix_length:
+            prefix += 1
+            half = 1 << (32 - prefix)
+            if network_int & half:
+                self._push(prefix, block)
+                block += half
+            else:
+                self._push(prefix, block + half)
+
+        self.allocated[network_int] = prefix_length
+        self.free_addresses -= 1 << (32 - prefix_length)
+        return self.details(network_int, prefix_length)
+
+    def release(self, network):
+        network_int = self._network_int(network)
+        if network_int not in self.allocated:
+            raise ValueError(f"{IPAddressConvert.int_to_ip(network_int)} chưa được cấp phát.")
+        prefix = self.allocated.pop(network_int)
+        self.free_addresses += 1 << (32 - prefix)
+
+        # Gộp với khối "buddy" khi cả hai cùng trống
+        while prefix > self.mask:
+            buddy = network_int ^ (1 << (32 - prefix))
+            if buddy not in self.free[prefix]:
+                break
+            self.free[prefix].remove(buddy)
+            network_int &= ~(1 << (32 - prefix))
+            prefix -= 1
+        self._push(prefix, network_int)
+
+    def _network_int(self, network):
+        if isinstance(network, int):
+            return network
+        if not isinstance(network, str):
+            network = network[NETWORK_KEY]
+        ip, _, prefix = network.partition('/')
+        network_int = IPAddressConvert.ip_to_int(ip)
+        if prefix and self.allocated.get(network_int) != int(prefix):
+            raise ValueError(f"{network} chưa được cấp phát.")
+        return network_int
+
+    def free_blocks(self):
+        blocks = sorted((network_int, prefix) for prefix, free in self.free.items() for network_int in free)
+        return SubnetTable([n for n, _ in blocks], [p for _, p in blocks])
+
+    def allocated_blocks(self):
+        blocks = sorted(self.allocated.items())
+        return SubnetTable([n for n, _ in blocks], [p for _, p in blocks])
+
+
+class IncrementalVLSM(SubnetAllocator):
+    def __init__(self, ip, mask):
+        super().__init__(ip, mask)
+        self.requirements = {}
+        self.by_hosts = {}
+
+    @classmethod
+    def from_plan(cls, ip, mask, subnets, host_requirements):
+        plan = cls(ip, mask)
+        for subnet, hosts in zip(subnets, host_requirements):
+            ip_prefix = subnet if isinstance(subnet, str) else subnet[NETWORK_KEY]
+            subnet_ip, _, prefix = ip_prefix.partition('/')
+            network_int = IPAddressConvert.ip_to_int(subnet_ip)
+            plan.reserve(network_int, prefix)
+            plan._assign(network_int, hosts)
+        return plan
+
+    def host_requirements(self):
+        return [self.requirements[network_int] for network_int in sorted(self.requirements)]
+
+    def subnet_table(self):
+        return self.allocated_blocks()
+
+    def _assign(self, network_int, hosts):
+        self.requirements[network_int] = hosts
+        self.by_hosts.setdefault(hosts, set()).add(network_int)
+
+    def _unassign(self, network_int):
+        hosts = self.requirements.pop(network_int, None)
+        if hosts is not None:
+            self.by_hosts[hosts].discard(network_int)
+        return hosts
+
+    def apply(self, added=(), removed=()):
+        change = {"added": [], "removed": [], "moved": []}
+        undo = []
+        try:
+            for hosts in removed:
+                if not self.by_hosts.get(hosts):
+                    raise ValueError(f"Không có yêu cầu {hosts} host trong kế hoạch.")
+                network_int = max(self.by_hosts[hosts])
+                change["removed"].append(self.details(network_int, self.allocated[network_int]))
+                self._evict(network_int, undo)
+            for hosts in sorted(added, reverse=True):
+                prefix_length = 32 - self.ceil_log2(hosts + 2)
+                network_int = self._place(prefix_length, change["moved"], undo)
+                self._assign(network_int, hosts)
+                change["added"].append(self.details(network_int, prefix_length))
+        except ValueError:
+            for action, network_int, prefix_length, hosts in reversed(undo):
+                if action == "placed":
+                    self._unassign(network_int)
+                    self.release(network_int)
+                else:
+                    self.reserve(network_int, prefix_length)
+                    if hosts is not None:
+                        self._assign(network_int, hosts)
+            raise
+        return change
+
+    def _evict(self, network_int, undo):
+        prefix_length = self.allocated[network_int]
+        hosts = self._unassign(network_int)
+        self.release(network_int)
+        undo.append(("evicted", network_int, prefix_length, hosts))
+        return prefix_length, hosts
+
+    def _place(self, prefix_length, moved, undo):
+        if prefix_length < self.mask or self.free_addresses < 1 << (32 - prefix_length):
+            raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+        try:
+            network_int = self._allocate(prefix_length)
+        except ValueError:
+            return self._make_room(prefix_length, moved, undo)
+        undo.append(("placed", network_int, prefix_length, None))
+        return network_int
+
+    def _make_room(self, prefix_length, moved, undo):
+        # Không gian trống bị phân mảnh: dời các mạng con nhỏ hơn trong khối
+        # có ít địa chỉ đang dùng nhất để lấy chỗ cho khối mới
+        block_mask = 0xFFFFFFFF ^ ((1 << (32 - prefix_length)) - 1)
+        occupants = {}
+        for network_int, prefix in self.allocated.items():
+            if prefix > prefix_length:
+                occupants.setdefault(network_int & block_mask, []).append(network_int)
+        if not occupants:
+            raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+        block = min(occupants, key=lambda b: (sum(1 << (32 - self.allocated[n]) for n in occupants[b]), b))
+
+        evicted = [(network_int, *self._evict(network_int, undo)) for network_int in occupants[block]]
+        self.reserve(block, prefix_length)
+        undo.append(("placed", block, prefix_length, None))
+        for old_network, prefix, hosts in sorted(evicted, key=lambda e: e[1]):
+            new_network = self._place(prefix, moved, undo)
+            if hosts is not None:
+                self._assign(new_network, hosts)
+            moved.append((self.details(old_network, prefix), self.details(new_network, prefix)))
+        return block
@@ -0,0 +1,138 @@
+import numpy as np
+
+_DOT, _SLASH, _NEWLINE, _CR = ord('.'), ord('/'), ord('\n'), ord('\r')
+
+_HALF_TEXT = None
+
+
+def _half_text():
+    global _HALF_TEXT
+    if _HALF_TEXT is None:
+        _HALF_TEXT = np.array([f"{i >> 8}.{i & 255}" for i in range(1 << 16)], dtype='U7')
+    return _HALF_TEXT
+
+
+def parse_buffer(buf):
+    b = np.frombuffer(buf, dtype=np.uint8) if not isinstance(buf, np.ndarray) else buf
+    if b.size == 0 or b[-1] != _NEWLINE:
+        b = np.append(b, np.uint8(_NEWLINE))
+
+    # Dấu phân cách là mọi byte không phải chữ số; với "\r\n" thì "\r"
+    # kết thúc dòng và "\n" theo sau được bỏ qua
+    separator = (b - np.uint8(48)) > 9
+    separator[1:] &= ~((b[1:] == _NEWLINE) & (b[:-1] == _CR))
+
+    sep_pos = np.flatnonzero(separator)
+    sep_chr = b[sep_pos]
+    line_break = (sep_chr == _NEWLINE) | (sep_chr == _CR)
+    field_start = np.empty_like(sep_pos)
+    field_start[0] = 0
+    # Chỉ bỏ qua thêm một byte khi "\r" đi liền với "\n"; "\r" đứng riêng cũng là một dòng mới
+    field_start[1:] = sep_pos[:-1] + 1 + ((sep_chr[:-1] == _CR) & (b[sep_pos[:-1] + 1] == _NEWLINE))
+    field_len = sep_pos - field_start
+
+    field_value = np.zeros(sep_pos.size, dtype=np.int64)
+    for k, scale in ((1, 1), (2, 10), (3, 100)):
+        digit = b[np.maximum(sep_pos - k, 0)].astype(np.int64) - 48
+        field_value += np.where(field_len >= k, digit * scale, 0)
+
+    line_end = np.flatnonzero(line_break)
+    line_start = np.empty_like(line_end)
+    line_start[0] = 0
+    line_start[1:] = line_end[:-1] + 1
+    num_fields = line_end - line_start + 1
+    has_prefix = num_fields == 5
+    blank = (num_fields == 1) & (field_len[line_start] == 0)
+
+    def field(k):
+        return np.minimum(line_start + k, line_end)
+
+    valid = (num_fields == 4) | has_prefix
+    for k in range(3):
+        valid &= sep_chr[field(k)] == _DOT
+    valid &= np.where(has_prefix, sep_chr[field(3)] == _SLASH, line_break[field(3)])
+
+    octets = []
+    for k in range(4):
+        length, value = field_len[field(k)], field_value[field(k)]
+        valid &= (length >= 1) & (length <= 3) & (value <= 255)
+        octets.append(value)
+    length, value = field_len[field(4)], field_value[field(4)]
+    valid &= ~has_prefix | ((length >= 1) & (length <= 2) & (value <= 32))
+
+    addresses = (octets[0] << 24) | (octets[1] << 16) | (octets[2] << 8) | octets[3]
+    addresses = np.where(valid, addresses, 0).astype(np.uint32)
+    prefixes = np.where(valid & has_prefix, value, 32).astype(np.uint8)
+    return addresses, prefixes, valid, has_prefix, blank
+
+
+def _parse_lines(lines, with_prefix):
+    lines = list(lines)
+    if not lines:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8)
+    addresses, prefixes, valid, has_prefix, _ = parse_buffer('\n'.join(lines).encode('ascii', 'replace'))
+    if valid.size != len(lines):
+        raise ValueError("Mỗi địa chỉ phải nằm trên một dòng riêng.")
+    invalid = np.flatnonzero(~valid | (has_prefix != with_prefix))
+    if invalid.size:
+        raise ValueError(f"Địa chỉ không hợp lệ: {lines[invalid[0]]}")
+    return addresses, prefixes
+
+
+def parse_ips(ips):
+    return _parse_lines(ips, False)[0]
+
+
+def parse_cidrs(cidrs):
+    return _parse_lines(cidrs, True)
+
+
+def format_ips(addresses):
+    addresses = np.asarray(addresses, dtype=np.uint32)
+    half_text = _half_text()
+    return np.char.add(np.char.add(half_text[addresses >> 16], '.'), half_text[addresses & 0xFFFF])
+
+
+def network_details(addresses, prefixes):
+    addresses = np.asarray(addresses, dtype=np.uint32)
+    prefixes = np.broadcast_to(np.asarray(prefixes, dtype=np.uint8), addresses.shape)
+    if (prefixes > 32).any():
+        raise ValueError("Mặt nạ mạng không nằm trong khoảng 0 - 32")
+    host_mask = ((np.uint64(1) << (32 - prefixes.astype(np.uint64))) - 1).astype(np.uint32)
+    network = addresses & ~host_mask
+    broadcast = network | host_mask
+    # /31 (RFC 3021) và /32 không có địa chỉ mạng/broadcast riêng
+    point_to_point = prefixes >= 31
+    return {
+        "network": network,
+        "broadcast": broadcast,
+        "first_host": np.where(point_to_point, network, network + np.uint32(1)),
+        "last_host": np.where(point_to_point, broadcast, broadcast - np.uint32(1)),
+        "num_hosts": host_mask.astype(np.int64) + np.where(point_to_point, 1, -1),
+    }
+
+
+def subnet_bases(network_int, prefix_length, num_subnets):
+    subnet_size = 1 << (32 - prefix_length)
+    return (network_int + np.arange(num_subnets, dtype=np.uint64) * subnet_size).astype(np.uint32)
+
+
+def details_columns(addresses, prefixes):
+    prefixes = np.broadcast_to(np.asarray(prefixes, dtype=np.uint8), np.shape(addresses))
+    details = network_details(addresses, prefixes)
+    network = np.char.add(np.char.add(format_ips(details["network"]), '/'), prefixes.astype('U2'))
+    address_range = np.char.add(np.char.add(format_ips(details["first_host"]), ' - '), format_ips(details["last_host"]))
+    broadcast = format_ips(details["broadcast"])
+    return network.tolist(), address_range.tolist(), broadcast.tolist(), details["num_hosts"].tolist()
+
+
+def details_to_dicts(addresses, prefixes):
+    return [
+        {
+            "Địa chỉ mạng": net,
+            "Dải địa chỉ": hosts_range,
+            "Địa chỉ broadcast": bc,
+            "Số lượng host": hosts,
+        }
+        for net, hosts_range, bc, hosts in zip(*details_columns(addresses, prefixes))
+    ]
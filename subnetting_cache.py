@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from subnetting import Subnetting, CIDR, VLSM, SubnetTable, IPAddressConvert, CalculatorAddressConvert
+
+
+class CachedPlan(Sequence):
+    # Kết quả dùng chung giữa các lần gọi: giữ SubnetTable gọn trong bộ nhớ,
+    # mỗi dòng là SubnetRow chỉ đọc và chỉ được định dạng khi truy cập
+    __slots__ = ('_table',)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        return len(self._table)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CachedPlan(self._table[index])
+        return self._table[index]
+
+    def __iter__(self):
+        return iter(self._table)
+
+    @property
+    def nbytes(self):
+        return self._table.nbytes
+
+    def to_dicts(self):
+        return self._table.to_dicts()
+
+    def to_table(self):
+        return self._table[:]
+
+    def __repr__(self):
+        return f"<CachedPlan {len(self)} subnets>"
+
+
+class PlanCache:
+    def __init__(self, maxsize=256, ttl=None, path=None, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS plans "
+                            "(key TEXT PRIMARY KEY, created REAL, networks BLOB, prefixes BLOB)")
+            self.db.commit()
+
+    def calculate_cidr(self, ip, mask, num_subnets):
+        num_subnets = int(num_subnets)
+        return self._get(("CIDR", ip, mask, num_subnets), lambda: CIDR(ip, mask).subnet_table(num_subnets))
+
+    def calculate_vlsm(self, ip, mask, host_requirements):
+        host_requirements = tuple(sorted((int(hosts) for hosts in host_requirements), reverse=True))
+        return self._get(("VLSM", ip, mask, host_requirements),
+                         lambda: VLSM(ip, mask).subnet_table(list(host_requirements)))
+
+    def network_details(self, ip, mask):
+        def plan():
+            subnet = Subnetting(ip, mask)
+            return SubnetTable([subnet.network_int], [subnet.mask])
+        return self._get(("DETAILS", ip, mask, None), plan)[0]
+
+    def _key(self, kind, ip, mask, args):
+        mask = int(mask)
+        network_int = CalculatorAddressConvert.network_int(IPAddressConvert.ip_to_int(ip), mask)
+        return f"{kind}|{network_int}|{mask}|{args!r}"
+
+    def get(self, kind, ip, mask, args):
+        # Tra cứu không tính toán: trả về None khi chưa có trong bộ nhớ lẫn trên đĩa
+        key = self._key(kind, ip, mask, args)
+        now = time.time()
+        subnets = self._lookup(key, now)
+        if subnets is None:
+            loaded = self._load(key, now)
+            if loaded is None:
+                with self.lock:
+                    self.misses += 1
+                return None
+            with self.lock:
+                self.disk_hits += 1
+            subnets = self._remember(key, loaded[1], loaded[0])
+        return subnets
+
+    def put(self, kind, ip, mask, args, table):
+        key = self._key(kind, ip, mask, args)
+        now = time.time()
+        self._store(key, now, table)
+        return self._remember(key, now, table)
+
+    def _get(self, request, plan):
+        subnets = self.get(*request)
+        if subnets is None:
+            subnets = self.put(*request, plan())
+        return subnets
+
+    def _lookup(self, key, now):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._evict(key)
+        return None
+
+    def _remember(self, key, created, table):
+        subnets = CachedPlan(table)
+        with self.lock:
+            if key in self.entries:
+                self._evict(key)
+            self.entries[key] = (created, subnets)
+            self.nbytes += subnets.nbytes
+            # Giới hạn theo số mục và (nếu có) theo dung lượng, luôn giữ lại mục vừa thêm
+            while len(self.entries) > 1 and (len(self.entries) > self.maxsize
+                                             or self.maxbytes is not None and self.nbytes > self.maxbytes):
+                self._evict(next(iter(self.entries)))
+                self.evictions += 1
+        return subnets
+
+    def _evict(self, key):
+        _, subnets = self.entries.pop(key)
+        self.nbytes -= subnets.nbytes
+
+    def _load(self, key, now):
+        if self.db is None:
+            return None
+        with self.lock:
+            row = self.db.execute("SELECT created, networks, prefixes FROM plans WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        created, networks, prefixes = row
+        if self.ttl is not None and now - created >= self.ttl:
+            return None
+        return SubnetTable.frombytes(networks, prefixes), created
+
+    def _store(self, key, now, table):
+        if self.db is None:
+            return
+        networks, prefixes = table.tobytes()
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?)", (key, now, networks, prefixes))
+            self.db.commit()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "bytes": self.nbytes,
+                "maxbytes": self.maxbytes,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+            if self.db is not None:
+                self.db.execute("DELETE FROM plans")
+                self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
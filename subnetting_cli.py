@@ -0,0 +1,200 @@
+import argparse
+import csv
+import json
+import sys
+from itertools import chain
+
+from subnetting import CIDR, VLSM, DETAIL_KEYS, is_ip, is_mask
+from subnetting_engine import AUTO, ENGINES, plan_tables
+from subnetting_export import EXPORTERS, iter_chunks, iter_json_rows, open_export, export, guess_format
+from subnetting_planfile import PLAN_SUFFIX, write_plan
+
+CSV_FIELDS = ("job", "mode", "ip_mask", "subnet") + DETAIL_KEYS + ("error",)
+BUFFER_SIZE = 1 << 16
+JOB_ERRORS = (ValueError, TypeError, ZeroDivisionError)
+
+
+def read_jobs(lines, input_format):
+    if input_format == "csv":
+        for row in csv.DictReader(lines):
+            yield row
+        return
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Dòng JSON không hợp lệ: {e}")
+
+
+def parse_ip_mask(ip_mask):
+    ip_mask = str(ip_mask or "").strip()
+    if ip_mask.count('/') != 1:
+        raise ValueError("Địa chỉ IP và mặt nạ mạng phải có dạng a.b.c.d/nn.")
+    ip, mask = ip_mask.split('/')
+    if not is_ip(ip):
+        raise ValueError("Địa chỉ IP không hợp lệ.")
+    if not is_mask(mask):
+        raise ValueError("Mặt nạ mạng không hợp lệ.")
+    return ip, int(mask)
+
+
+def parse_job(job):
+    if not isinstance(job, dict):
+        raise ValueError("Mỗi yêu cầu phải là một đối tượng gồm mode, ip_mask, extra_input.")
+    mode = str(job.get("mode") or "").strip().upper()
+    ip, mask = parse_ip_mask(job.get("ip_mask"))
+    extra_input = job.get("extra_input")
+
+    if mode == "CIDR":
+        num_subnets = int(extra_input)
+        if num_subnets < 1:
+            raise ValueError("Số mạng con phải lớn hơn 0.")
+        return CIDR(ip, mask), num_subnets
+    if mode == "VLSM":
+        if isinstance(extra_input, str):
+            extra_input = extra_input.split(',')
+        packed = str(job.get("packed") or "").strip().lower() in ("1", "true", "yes")
+        return VLSM(ip, mask, packed), [int(x) for x in extra_input]
+    raise ValueError("Chế độ không hợp lệ.")
+
+
+def plan_job(job, engine=AUTO):
+    planner, argument = parse_job(job)
+    tables = iter(plan_tables(planner, argument, engine))
+    # Sinh trước khối đầu tiên để lỗi của engine lộ ra trước khi bắt đầu ghi bản ghi
+    first = next(tables, None)
+    return tables if first is None else chain((first,), tables)
+
+
+class JsonlWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write_job(self, number, job, subnets):
+        write = self.out.write
+        write(f'{{"job": {number}, "mode": {json.dumps(job.get("mode"), ensure_ascii=False)}, '
+              f'"ip_mask": {json.dumps(job.get("ip_mask"), ensure_ascii=False)}, "subnets": [')
+        try:
+            for i, rows in enumerate(iter_json_rows(subnets)):
+                write((', ' if i else '') + ', '.join(rows))
+        except JOB_ERRORS as e:
+            # Lỗi giữa chừng: đóng bản ghi với các mạng con đã ghi kèm thông báo lỗi
+            write(f'], "error": {json.dumps(str(e), ensure_ascii=False)}}}\n')
+            return e
+        write(']}\n')
+        return None
+
+    def write_error(self, number, job, error):
+        job = job if isinstance(job, dict) else {}
+        record = {"job": number, "mode": job.get("mode"), "ip_mask": job.get("ip_mask"), "error": str(error)}
+        self.out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class CsvWriter:
+    def __init__(self, out):
+        self.writer = csv.writer(out)
+        self.writer.writerow(CSV_FIELDS)
+
+    def write_job(self, number, job, subnets):
+        mode, ip_mask = job.get("mode"), job.get("ip_mask")
+        count = 0
+        try:
+            for chunk in iter_chunks(subnets):
+                self.writer.writerows(
+                    (number, mode, ip_mask, i, *(subnet[key] for key in DETAIL_KEYS), "")
+                    for i, subnet in enumerate(chunk, count + 1)
+                )
+                count += len(chunk)
+        except JOB_ERRORS as e:
+            self.write_error(number, job, e)
+            return e
+        return None
+
+    def write_error(self, number, job, error):
+        job = job if isinstance(job, dict) else {}
+        self.writer.writerow((number, job.get("mode"), job.get("ip_mask"), "", "", "", "", "", str(error)))
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter}
+
+
+def run_jobs(lines, out, input_format="jsonl", output_format="jsonl", engine=AUTO):
+    writer = WRITERS[output_format](out)
+    errors = 0
+    for number, job in enumerate(read_jobs(lines, input_format), 1):
+        try:
+            if isinstance(job, Exception):
+                raise job
+            subnets = plan_job(job, engine)
+        except JOB_ERRORS as e:
+            writer.write_error(number, job, e)
+            errors += 1
+            continue
+        if writer.write_job(number, job, subnets) is not None:
+            errors += 1
+    return errors
+
+
+def export_plan(args):
+    planner, argument = parse_job({"mode": args.mode, "ip_mask": args.ip_mask, "extra_input": args.extra_input,
+                                   "packed": args.packed})
+    output_format = args.output_format or guess_format(args.output)
+    if args.output.lower().endswith(PLAN_SUFFIX):
+        count = write_plan(args.output, planner, argument, args.engine)
+    elif args.output == "-":
+        count = EXPORTERS[output_format](plan_tables(planner, argument, args.engine), sys.stdout)
+        sys.stdout.flush()
+    else:
+        count = export(plan_tables(planner, argument, args.engine), args.output, output_format, args.gzip or None)
+    print(f"Đã xuất {count} mạng con.", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chia mạng CIDR/VLSM hàng loạt từ file JSONL hoặc CSV.")
+    parser.add_argument("input", nargs="?", default="-", help="File yêu cầu (mặc định: stdin)")
+    parser.add_argument("-o", "--output", default="-", help=f"File kết quả (mặc định: stdout, *{PLAN_SUFFIX}: kế hoạch nhị phân)")
+    parser.add_argument("--input-format", choices=WRITERS, help="Định dạng đầu vào (jsonl/csv)")
+    parser.add_argument("--output-format", choices=EXPORTERS, help="Định dạng đầu ra (jsonl/csv, json khi xuất một kế hoạch)")
+    parser.add_argument("--gzip", action="store_true", help="Nén file kết quả bằng gzip")
+    parser.add_argument("--mode", choices=["CIDR", "VLSM"], help="Xuất trực tiếp một kế hoạch thay vì đọc file yêu cầu")
+    parser.add_argument("--ip-mask", help="Địa chỉ mạng cha của kế hoạch (VD: 10.0.0.0/8)")
+    parser.add_argument("--extra-input", help="Số mạng con hoặc danh sách yêu cầu host của kế hoạch")
+    parser.add_argument("--packed", action="store_true", help="VLSM: cấp khối nhỏ nhất vừa đủ cho mỗi yêu cầu")
+    parser.add_argument("--engine", default=AUTO, choices=[AUTO, *ENGINES],
+                        help="Engine tính toán (mặc định: auto, chọn theo dữ liệu hiệu chỉnh SUBNETTING_CALIBRATION)")
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        try:
+            return export_plan(args)
+        except JOB_ERRORS as e:
+            print(e, file=sys.stderr)
+            return 1
+
+    input_format = args.input_format or guess_format(args.input, "jsonl")
+    output_format = args.output_format or guess_format(args.output, "jsonl")
+    if output_format not in WRITERS:
+        parser.error("Chế độ xử lý hàng loạt chỉ hỗ trợ đầu ra jsonl hoặc csv.")
+    source = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8', newline='',
+                                                      buffering=BUFFER_SIZE)
+    target = sys.stdout if args.output == "-" else open_export(args.output, args.gzip or None)
+    try:
+        errors = run_jobs(source, target, input_format, output_format, args.engine)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        else:
+            target.flush()
+    if errors:
+        print(f"Có {errors} yêu cầu bị lỗi.", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
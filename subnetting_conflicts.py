@@ -0,0 +1,110 @@
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from subnetting import CIDR, VLSM, SubnetTable, subnetting_batch
+from subnetting_allocator import SubnetAllocator
+from subnetting_summary import summarize
+
+Conflict = namedtuple("Conflict", ["plan_index", "inventory_index", "relation"])
+
+EQUAL = "equal"
+CONTAINS = "contains"
+INSIDE = "inside"
+
+
+class Inventory:
+    def __init__(self, prefixes):
+        self.table = SubnetTable.from_prefixes(prefixes)
+        # Khoá sắp xếp (địa chỉ mạng, prefix): khối con luôn đứng sau khối cha cùng địa chỉ đầu
+        if subnetting_batch is not None:
+            np = subnetting_batch.np
+            keys = (np.frombuffer(self.table.networks, dtype=np.uint32).astype(np.int64) << 6) \
+                | np.frombuffer(self.table.prefixes, dtype=np.uint8)
+            order = np.argsort(keys, kind='stable')
+            self.keys = array('q', keys[order].tobytes())
+            self.order = array('q', order.astype(np.int64).tobytes())
+        else:
+            keys = [(network << 6) | prefix for network, prefix in zip(self.table.networks, self.table.prefixes)]
+            self.order = array('q', sorted(range(len(keys)), key=keys.__getitem__))
+            self.keys = array('q', (keys[i] for i in self.order))
+        self.prefix_lengths = sorted(set(self.table.prefixes))
+
+    def __len__(self):
+        return len(self.table)
+
+    def _equal_range(self, key):
+        start = bisect_left(self.keys, key)
+        stop = start
+        while stop < len(self.keys) and self.keys[stop] == key:
+            stop += 1
+        return range(start, stop)
+
+    def inside(self, network_int, prefix_length):
+        # Các khối của kho nằm trong (hoặc trùng) khối đã cho
+        end = network_int + (1 << (32 - prefix_length))
+        return range(bisect_left(self.keys, (network_int << 6) | prefix_length), bisect_left(self.keys, end << 6))
+
+    def containing(self, network_int, prefix_length):
+        # Các khối của kho bao trùm khối đã cho (prefix ngắn hơn)
+        for prefix in self.prefix_lengths:
+            if prefix >= prefix_length:
+                break
+            mask = 0xFFFFFFFF ^ ((1 << (32 - prefix)) - 1)
+            yield from self._equal_range(((network_int & mask) << 6) | prefix)
+
+    def conflicts(self, plan):
+        plan = SubnetTable.from_prefixes(plan)
+        keys, order = self.keys, self.order
+        found = []
+        for plan_index, (network_int, prefix_length) in enumerate(zip(plan.networks, plan.prefixes)):
+            for position in self.containing(network_int, prefix_length):
+                found.append(Conflict(plan_index, order[position], INSIDE))
+            for position in self.inside(network_int, prefix_length):
+                relation = EQUAL if keys[position] == (network_int << 6) | prefix_length else CONTAINS
+                found.append(Conflict(plan_index, order[position], relation))
+        return found
+
+    def is_free(self, network_int, prefix_length):
+        return not self.inside(network_int, prefix_length) and next(self.containing(network_int, prefix_length), None) is None
+
+    def allocator(self, ip, mask):
+        allocator = SubnetAllocator(ip, mask)
+        if next(self.containing(allocator.network_int, allocator.mask), None) is not None:
+            raise ValueError("Toàn bộ mạng đã được sử dụng.")
+        # Gộp các khối đang dùng trong mạng cha thành các khối rời nhau rồi đánh dấu đã cấp phát
+        used = self.inside(allocator.network_int, allocator.mask)
+        blocks = SubnetTable(array('I', (self.table.networks[self.order[i]] for i in used)),
+                             array('B', (self.table.prefixes[self.order[i]] for i in used)))
+        summary = summarize(blocks).table
+        for network_int, prefix_length in zip(summary.networks, summary.prefixes):
+            allocator.reserve(network_int, prefix_length)
+        return allocator
+
+    def plan_cidr(self, ip, mask, num_subnets):
+        allocator = self.allocator(ip, mask)
+        prefix_length = CIDR(ip, mask).split_prefix(num_subnets)
+        # Chọn khối lớn nhất mà phần địa chỉ còn trống vẫn chứa đủ số mạng con
+        while prefix_length <= 30:
+            capacity = sum(len(free) << (prefix_length - prefix)
+                           for prefix, free in allocator.free.items() if prefix <= prefix_length)
+            if capacity >= num_subnets:
+                break
+            prefix_length += 1
+        else:
+            raise ValueError("Không đủ địa chỉ trống để chia mạng theo yêu cầu.")
+        networks = sorted(allocator.allocate_block(prefix_length) for _ in range(num_subnets))
+        return SubnetTable(networks, array('B', [prefix_length]) * num_subnets)
+
+    def plan_vlsm(self, ip, mask, host_requirements):
+        allocator = self.allocator(ip, mask)
+        table = SubnetTable()
+        for _, prefix_length in VLSM(ip, mask).iter_blocks(host_requirements):
+            table.append(allocator.allocate_block(prefix_length), prefix_length)
+        return table
+
+
+def find_conflicts(inventory, plan):
+    if not isinstance(inventory, Inventory):
+        inventory = Inventory(inventory)
+    return inventory.conflicts(plan)
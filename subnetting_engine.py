@@ -0,0 +1,213 @@
+import json
+import os
+import random
+from math import log2
+
+import subnetting
+import subnetting_lib
+from subnetting import NETWORK_KEY, SubnetTable
+
+AUTO = "auto"
+DEFAULT_ENGINE = "subnetting"
+CALIBRATION_ENV = "SUBNETTING_CALIBRATION"
+CASES = ("details", "cidr", "vlsm")
+
+
+class Engine:
+    name = None
+
+    def __init__(self, module):
+        self.module = module
+
+    def supports(self, case, prefix, size=1, packed=False):
+        return case in CASES
+
+    def details(self, ip, mask):
+        return self.module.Subnetting(ip, mask).get_network_details()
+
+    def cidr(self, ip, mask, num_subnets):
+        return self.module.CIDR(ip, mask).calculate_subnets(num_subnets)
+
+    def vlsm(self, ip, mask, host_requirements, packed=False):
+        return self.module.VLSM(ip, mask).calculate_subnets(list(host_requirements))
+
+    def run(self, case, ip, mask, argument=None, packed=False):
+        if case == "details":
+            return self.details(ip, mask)
+        if case == "cidr":
+            return self.cidr(ip, mask, argument)
+        return self.vlsm(ip, mask, argument, packed)
+
+    def blocks(self, case, ip, mask, argument, packed=False):
+        # Mặc định đọc lại địa chỉ mạng từ kết quả dạng dict; engine nên ghi đè để sinh khối dần dần
+        return (prefix for prefix in SubnetTable.from_prefixes(
+            subnet[NETWORK_KEY] for subnet in self.run(case, ip, mask, argument, packed)))
+
+    def subnet_table(self, case, ip, mask, argument, packed=False):
+        table = SubnetTable()
+        for network_int, prefix_length in self.blocks(case, ip, mask, argument, packed):
+            table.append(network_int, prefix_length)
+        return table
+
+    def iter_tables(self, case, ip, mask, argument, chunk_size=4096, packed=False):
+        return _iter_tables(self.blocks(case, ip, mask, argument, packed), chunk_size)
+
+    def __repr__(self):
+        return f"<Engine {self.name}>"
+
+
+class NativeEngine(Engine):
+    name = "subnetting"
+
+    def planner(self, case, ip, mask, packed=False):
+        if case == "cidr":
+            return self.module.CIDR(ip, mask)
+        return self.module.VLSM(ip, mask, packed)
+
+    def vlsm(self, ip, mask, host_requirements, packed=False):
+        return self.module.VLSM(ip, mask, packed).calculate_subnets(list(host_requirements))
+
+    def subnet_table(self, case, ip, mask, argument, packed=False):
+        return self.planner(case, ip, mask, packed).subnet_table(argument)
+
+    def iter_tables(self, case, ip, mask, argument, chunk_size=4096, packed=False):
+        return self.planner(case, ip, mask, packed).iter_tables(argument, chunk_size)
+
+
+class LibEngine(Engine):
+    name = "subnetting_lib"
+
+    def supports(self, case, prefix, size=1, packed=False):
+        # subnetting_lib không có chế độ VLSM đóng gói
+        return case in CASES and not packed
+
+    def blocks(self, case, ip, mask, argument, packed=False):
+        if case == "cidr":
+            networks = self.module.CIDR(ip, mask).iter_networks(argument)
+        else:
+            networks = self.module.VLSM(ip, mask).iter_networks(list(argument))
+        return ((int(network.network_address), network.prefixlen) for network in networks)
+
+
+ENGINES = {}
+CALIBRATION = {}
+
+
+def _iter_tables(blocks, chunk_size):
+    table = SubnetTable()
+    for network_int, prefix_length in blocks:
+        table.append(network_int, prefix_length)
+        if len(table) == chunk_size:
+            yield table
+            table = SubnetTable()
+    if len(table):
+        yield table
+
+
+def register_engine(engine):
+    ENGINES[engine.name] = engine
+    return engine
+
+
+register_engine(NativeEngine(subnetting))
+register_engine(LibEngine(subnetting_lib))
+
+
+def load_calibration(source):
+    # Nhận kết quả của bench_subnetting --calibrate (file JSON, báo cáo có khoá "results" hoặc danh sách record).
+    # CIDR/VLSM chỉ lấy các record đo đúng đường iter_tables mà engine auto sẽ chạy
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', encoding='utf-8') as file:
+            source = json.load(file)
+    if isinstance(source, dict):
+        source = source["results"]
+    CALIBRATION.clear()
+    for record in source:
+        if "error" in record or record.get("engine") not in ENGINES or record.get("case") not in CASES:
+            continue
+        if record["case"] != "details" and record.get("path") != "tables":
+            continue
+        point = (record["case"], record["prefix"], record["size"])
+        CALIBRATION.setdefault(point, {})[record["engine"]] = record["median"]
+    return len(CALIBRATION)
+
+
+def _nearest_point(case, prefix, size):
+    points = [point for point in CALIBRATION if point[0] == case]
+    if not points:
+        return None
+    return min(points, key=lambda point: (abs(point[1] - prefix), abs(log2(point[2]) - log2(max(size, 1)))))
+
+
+def select_engine(case, prefix, size=1, packed=False):
+    if not CALIBRATION and os.environ.get(CALIBRATION_ENV):
+        load_calibration(os.environ[CALIBRATION_ENV])
+    candidates = [engine for engine in ENGINES.values() if engine.supports(case, prefix, size, packed)]
+    point = _nearest_point(case, prefix, size)
+    timings = CALIBRATION.get(point, {})
+    measured = [engine for engine in candidates if engine.name in timings]
+    if measured:
+        return min(measured, key=lambda engine: timings[engine.name])
+    return ENGINES[DEFAULT_ENGINE]
+
+
+def get_engine(name=AUTO, case="cidr", prefix=24, size=1, packed=False):
+    if name == AUTO:
+        return select_engine(case, prefix, size, packed)
+    try:
+        engine = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Không có engine {name}.")
+    if not engine.supports(case, prefix, size, packed):
+        raise ValueError(f"Engine {name} không hỗ trợ {case} cho /{prefix} với {size} mạng con.")
+    return engine
+
+
+def plan_tables(planner, argument, engine=AUTO, chunk_size=4096):
+    # Chọn engine cho một planner CIDR/VLSM đã kiểm tra đầu vào rồi sinh kết quả theo từng SubnetTable
+    case = "cidr" if isinstance(planner, subnetting.CIDR) else "vlsm"
+    size = argument if case == "cidr" else len(argument)
+    packed = getattr(planner, "packed", False)
+    engine = get_engine(engine, case, planner.mask, size, packed)
+    return engine.iter_tables(case, planner.ip, planner.mask, argument, chunk_size, packed)
+
+
+def random_cases(count, seed=0):
+    # Gồm cả /31, /32 và các yêu cầu vượt quá mạng cha để so sánh cả trường hợp lỗi
+    rng = random.Random(seed)
+    for _ in range(count):
+        case = rng.choice(CASES)
+        ip = ".".join(str(rng.randint(0, 255)) for _ in range(4))
+        if case == "details":
+            yield case, ip, rng.randint(1, 32), None
+        elif case == "cidr":
+            prefix = rng.randint(8, 32)
+            yield case, ip, prefix, rng.randint(1, min(1 << (32 - prefix), 4096))
+        else:
+            prefix = rng.randint(8, 30)
+            space = 1 << (32 - prefix)
+            yield case, ip, prefix, [rng.randint(0, max(1, space // 4)) for _ in range(rng.randint(1, 8))]
+
+
+def _outcome(engine, case, ip, mask, argument):
+    try:
+        return engine.run(case, ip, mask, argument)
+    except ValueError:
+        return ValueError
+
+
+def differential(cases, engines=None, reference=DEFAULT_ENGINE):
+    # Chạy cùng đầu vào trên mọi engine hỗ trợ và trả về các trường hợp cho kết quả khác engine tham chiếu
+    engines = [ENGINES[name] for name in (engines or ENGINES)]
+    reference = ENGINES[reference]
+    mismatches = []
+    for case, ip, mask, argument in cases:
+        size = len(argument) if case == "vlsm" else argument or 1
+        expected = _outcome(reference, case, ip, mask, argument)
+        for engine in engines:
+            if engine is reference or not engine.supports(case, mask, size):
+                continue
+            got = _outcome(engine, case, ip, mask, argument)
+            if got != expected:
+                mismatches.append((engine.name, case, ip, mask, argument, expected, got))
+    return mismatches
@@ -0,0 +1,106 @@
+import csv
+import gzip
+import json
+
+from subnetting import SubnetTable, DETAIL_KEYS
+
+EXPORT_ROWS = 8192
+BUFFER_SIZE = 1 << 16
+
+# Các giá trị do bộ chia mạng định dạng (địa chỉ, dải, số host) không chứa
+# ký tự cần thoát trong JSON nên có thể ghép thẳng vào mẫu
+ROW_TEMPLATE = "{%s}" % ", ".join(
+    json.dumps(key, ensure_ascii=False) + (': %d' if key == DETAIL_KEYS[-1] else ': "%s"') for key in DETAIL_KEYS
+)
+CSV_TEMPLATE = "%s,%s,%s,%d\r\n"
+
+
+def _iter_blocks(subnets, chunk_rows):
+    if isinstance(subnets, SubnetTable):
+        subnets = (subnets,)
+    chunk = []
+    for subnet in subnets:
+        if isinstance(subnet, SubnetTable):
+            if chunk:
+                yield chunk
+                chunk = []
+            for start in range(0, len(subnet), chunk_rows):
+                yield subnet[start:start + chunk_rows]
+            continue
+        chunk.append(subnet if isinstance(subnet, dict) else dict(subnet))
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_chunks(subnets, chunk_rows=EXPORT_ROWS):
+    for block in _iter_blocks(subnets, chunk_rows):
+        yield block.to_dicts() if isinstance(block, SubnetTable) else block
+
+
+def iter_json_rows(subnets, chunk_rows=EXPORT_ROWS):
+    for block in _iter_blocks(subnets, chunk_rows):
+        if isinstance(block, SubnetTable):
+            yield [ROW_TEMPLATE % row for row in zip(*block.to_columns())]
+        else:
+            yield [json.dumps(subnet, ensure_ascii=False) for subnet in block]
+
+
+def write_csv(subnets, out, chunk_rows=EXPORT_ROWS):
+    writer = csv.writer(out)
+    writer.writerow(DETAIL_KEYS)
+    count = 0
+    for block in _iter_blocks(subnets, chunk_rows):
+        if isinstance(block, SubnetTable):
+            out.write(''.join([CSV_TEMPLATE % row for row in zip(*block.to_columns())]))
+        else:
+            writer.writerows([subnet[key] for key in DETAIL_KEYS] for subnet in block)
+        count += len(block)
+    return count
+
+
+def write_jsonl(subnets, out, chunk_rows=EXPORT_ROWS):
+    count = 0
+    for rows in iter_json_rows(subnets, chunk_rows):
+        out.write('\n'.join(rows) + '\n')
+        count += len(rows)
+    return count
+
+
+def write_json(subnets, out, chunk_rows=EXPORT_ROWS):
+    count = 0
+    out.write('[')
+    for rows in iter_json_rows(subnets, chunk_rows):
+        out.write((', ' if count else '') + ', '.join(rows))
+        count += len(rows)
+    out.write(']\n')
+    return count
+
+
+EXPORTERS = {"csv": write_csv, "json": write_json, "jsonl": write_jsonl}
+
+
+def guess_format(path, default="csv"):
+    path = path.lower()
+    if path.endswith(".gz"):
+        path = path[:-3]
+    extension = path.rpartition('.')[2]
+    return extension if extension in EXPORTERS else default
+
+
+def open_export(path, compress=None):
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+    return open(path, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE)
+
+
+def export(subnets, path, output_format=None, compress=None, chunk_rows=EXPORT_ROWS):
+    output_format = output_format or guess_format(path)
+    if output_format not in EXPORTERS:
+        raise ValueError("Định dạng xuất không hợp lệ. Chỉ chấp nhận csv, json hoặc jsonl.")
+    with open_export(path, compress) as out:
+        return EXPORTERS[output_format](subnets, out, chunk_rows)
@@ -0,0 +1,77 @@
+from array import array
+from bisect import bisect_right
+
+from subnetting import SubnetTable, IPAddressConvert, CalculatorAddressConvert, subnetting_batch
+
+
+class PrefixIndex:
+    def __init__(self, prefixes):
+        self.table = SubnetTable.from_prefixes(prefixes)
+        self.starts = array('I')
+        self.owners = array('l')
+        self._build()
+        self._np_starts = None
+        self._np_owners = None
+
+    def _emit(self, start, owner):
+        if self.owners and self.owners[-1] == owner:
+            return
+        if self.starts and self.starts[-1] == start:
+            self.owners[-1] = owner
+            if len(self.owners) > 1 and self.owners[-2] == owner:
+                self.starts.pop()
+                self.owners.pop()
+            return
+        self.starts.append(start)
+        self.owners.append(owner)
+
+    def _build(self):
+        # Quét các prefix theo thứ tự địa chỉ, prefix lồng bên trong
+        # (cụ thể hơn) ghi đè lên khoảng của prefix bao ngoài
+        host_mask = CalculatorAddressConvert.host_mask
+        order = sorted(range(len(self.table)),
+                       key=lambda i: (self.table.networks[i], self.table.prefixes[i], -i))
+        stack = []
+        cursor = 0
+        for i in order:
+            start = self.table.networks[i]
+            end = start + host_mask(self.table.prefixes[i]) + 1
+            while stack and stack[-1][0] <= start:
+                top_end, top = stack.pop()
+                if cursor < top_end:
+                    self._emit(cursor, top)
+                    cursor = top_end
+            if cursor < start:
+                self._emit(cursor, stack[-1][1] if stack else -1)
+            self._emit(start, i)
+            cursor = start
+            stack.append((end, i))
+        while stack:
+            top_end, top = stack.pop()
+            if cursor < top_end:
+                self._emit(cursor, top)
+                cursor = top_end
+        if cursor < 1 << 32:
+            self._emit(cursor, -1)
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup_index(self, ip):
+        ip_int = ip if isinstance(ip, int) else IPAddressConvert.ip_to_int(ip)
+        position = bisect_right(self.starts, ip_int) - 1
+        return self.owners[position] if position >= 0 else -1
+
+    def lookup(self, ip):
+        index = self.lookup_index(ip)
+        return self.table[index] if index >= 0 else None
+
+    def lookup_many(self, addresses):
+        if subnetting_batch is None:
+            return array('l', (self.lookup_index(ip) for ip in addresses))
+        np = subnetting_batch.np
+        if self._np_starts is None:
+            self._np_starts = np.frombuffer(self.starts, dtype=np.uint32)
+            self._np_owners = np.frombuffer(self.owners, dtype=np.dtype('l'))
+        positions = np.searchsorted(self._np_starts, np.asarray(addresses, dtype=np.uint32), side='right') - 1
+        return np.where(positions >= 0, self._np_owners[np.maximum(positions, 0)], -1)
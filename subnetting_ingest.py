@@ -0,0 +1,71 @@
+import mmap
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from subnetting_batch import parse_buffer
+
+CHUNK_SIZE = 1 << 20
+
+IngestResult = namedtuple("IngestResult", ["addresses", "prefixes", "malformed"])
+
+
+def _chunks(buffer, chunk_size):
+    size = len(buffer)
+    start = 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            # Cắt sau "\n" hoặc sau "\r" đứng riêng, không tách đôi "\r\n"
+            newline = max(buffer.rfind(b'\n', start, end), buffer.rfind(b'\r', start, end - 1))
+            if newline < 0:
+                newline = buffer.find(b'\n', end)
+                cr = buffer.find(b'\r', end)
+                if cr >= 0 and (newline < 0 or cr + 1 < newline):
+                    newline = cr
+            end = size if newline < 0 else newline + 1
+        yield start, end
+        start = end
+
+
+def ingest_buffer(buffer, mode="auto", chunk_size=CHUNK_SIZE):
+    if mode not in ("auto", "ip", "cidr"):
+        raise ValueError("Chế độ không hợp lệ. Chỉ chấp nhận auto, ip hoặc cidr.")
+
+    # Lượt 1: đếm số dòng để cấp phát mảng kết quả một lần
+    capacity = 0
+    for start, end in _chunks(buffer, chunk_size):
+        view = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+        capacity += (int(np.count_nonzero(view == 10)) + int(np.count_nonzero((view[:-1] == 13) & (view[1:] != 10)))
+                     + (view[-1] != 10))
+        del view
+
+    addresses = np.empty(capacity, dtype=np.uint32)
+    prefixes = np.empty(capacity, dtype=np.uint8)
+    malformed = array('Q')
+    count = 0
+    line_offset = 1
+    for start, end in _chunks(buffer, chunk_size):
+        view = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+        chunk_addresses, chunk_prefixes, valid, has_prefix, blank = parse_buffer(view)
+        del view
+        if mode == "ip":
+            valid &= ~has_prefix
+        elif mode == "cidr":
+            valid &= has_prefix
+        malformed.extend((np.flatnonzero(~valid & ~blank) + line_offset).tolist())
+        kept = int(np.count_nonzero(valid))
+        addresses[count:count + kept] = chunk_addresses[valid]
+        prefixes[count:count + kept] = chunk_prefixes[valid]
+        count += kept
+        line_offset += valid.size
+    return IngestResult(addresses[:count], prefixes[:count], malformed)
+
+
+def ingest_file(path, mode="auto", chunk_size=CHUNK_SIZE):
+    with open(path, 'rb') as file:
+        if file.seek(0, 2) == 0:
+            return ingest_buffer(b"", mode, chunk_size)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return ingest_buffer(buffer, mode, chunk_size)
@@ -1,4 +1,5 @@
 import ipaddress
+from itertools import islice
 from math import log2, floor, ceil
 
 class Subnetting:
@@ -7,12 +8,21 @@ class Subnetting:
         self.mask = int(mask)
 
     def get_network_details(self):
-        hosts = list(self.network.hosts())
+        network_address = self.network.network_address
+        broadcast_address = self.network.broadcast_address
+        num_addresses = self.network.num_addresses
+        if num_addresses > 2:
+            first_host, last_host = network_address + 1, broadcast_address - 1
+            num_hosts = num_addresses - 2
+        else:
+            # /31 (RFC 3021) và /32 không có địa chỉ mạng/broadcast riêng
+            first_host, last_host = network_address, broadcast_address
+            num_hosts = num_addresses
         return {
-            "Địa chỉ mạng": f"{self.network.network_address}/{self.network.prefixlen}",
-            "Dải địa chỉ": f"{hosts[0]} - {hosts[-1]}" if hosts else "No usable hosts",
-            "Địa chỉ broadcast": str(self.network.broadcast_address),
-            "Số lượng host": self.network.num_addresses - 2 if self.network.num_addresses > 2 else 0
+            "Địa chỉ mạng": f"{network_address}/{self.network.prefixlen}",
+            "Dải địa chỉ": f"{first_host} - {last_host}",
+            "Địa chỉ broadcast": str(broadcast_address),
+            "Số lượng host": num_hosts
         }
 
 class CIDR(Subnetting):
@@ -20,54 +30,56 @@ class CIDR(Subnetting):
         super().__init__(ip, mask)
         self.prefix_length = None
 
-    def calculate_subnets(self, num_subnets):    
-        if self.network.num_addresses/num_subnets < 1:
+    def calculate_subnets(self, num_subnets):
+        return list(self.iter_subnets(num_subnets))
+
+    def iter_subnets(self, num_subnets, start=0, count=None):
+        return (Subnetting(network.network_address, network.prefixlen).get_network_details()
+                for network in self.iter_networks(num_subnets, start, count))
+
+    def iter_networks(self, num_subnets, start=0, count=None):
+        host_bits = floor(log2(self.network.num_addresses / num_subnets))
+        if host_bits < 2:
             raise ValueError(f"Không thể chia vì với {num_subnets} mạng con thì mỗi mạng có 0 địa chỉ khả dụng .")
-        else:
-            self.prefix_length = 32 - floor(log2(self.network.num_addresses/num_subnets))       
-        subnets = []
-        subnet_networks = list(self.network.subnets(new_prefix=self.prefix_length))
-
-        for i in range(num_subnets):
-            subnet = Subnetting(
-                str(subnet_networks[i].network_address),
-                str(subnet_networks[i].prefixlen)
-            )
-            subnets.append(subnet.get_network_details())
-        return subnets
+        self.prefix_length = 32 - host_bits
+        stop = num_subnets if count is None else min(num_subnets, start + count)
+        return self._iter_networks(start, stop, self.prefix_length)
+
+    def _iter_networks(self, start, stop, prefix_length):
+        network_int = int(self.network.network_address)
+        subnet_size = 1 << (32 - prefix_length)
+        for i in range(start, stop):
+            yield ipaddress.IPv4Network((network_int + i * subnet_size, prefix_length))
 
 class VLSM(Subnetting):
     def calculate_subnets(self, host_requirements):
+        return list(self.iter_subnets(host_requirements))
+
+    def iter_subnets(self, host_requirements, start=0, count=None):
+        return (Subnetting(network.network_address, network.prefixlen).get_network_details()
+                for network in self.iter_networks(host_requirements, start, count))
+
+    def iter_networks(self, host_requirements, start=0, count=None):
         host_requirements.sort(reverse=True)
-        subnets = []
-        available_network = self.network
-        
+        if host_requirements and 32 - ceil(log2(host_requirements[0] + 2)) < self.mask:
+            raise ValueError("Không đủ không gian địa chỉ cho subnet 1")
+        stop = None if count is None else start + count
+        return islice(self._iter_networks(host_requirements), start, stop)
+
+    def _iter_networks(self, host_requirements):
+        available = int(self.network.network_address)
+        end = int(self.network.broadcast_address) + 1
+        prefix_length = None
+
         for i, hosts in enumerate(host_requirements):
-            if i >= 1:
-                prefix_new = 32 - ceil(log2(hosts + 2))
-                prefix_old = 32 - ceil(log2(host_requirements[i - 1] + 2))
-                if prefix_new == prefix_old or prefix_new - prefix_old == 1:
-                    prefix_length = prefix_old
-                else:
-                    prefix_length = prefix_new
-            else:
-                required_size = ceil(log2(hosts + 2))
-                prefix_length = 32 - required_size
-            try:
-                subnet_network = next(available_network.subnets(new_prefix=prefix_length))
-                subnet = Subnetting(
-                    str(subnet_network.network_address),
-                    str(subnet_network.prefixlen)
-                )
-                subnets.append(subnet.get_network_details())
-                available_network = ipaddress.IPv4Network(
-                    f"{subnet_network.broadcast_address + 1}/{self.mask}",
-                    strict=False
-                )
-            except (ValueError, StopIteration):
+            # Chênh lệch không quá 1 bit so với khối vừa cấp thì cấp luôn khối cùng kích thước
+            prefix_new = 32 - ceil(log2(hosts + 2))
+            if prefix_length is None or prefix_new - prefix_length not in (0, 1):
+                prefix_length = prefix_new
+            if prefix_length < self.mask or available + (1 << (32 - prefix_length)) > end:
                 raise ValueError(f"Không đủ không gian địa chỉ cho subnet {i + 1}")
-                
-        return subnets
+            yield ipaddress.IPv4Network((available, prefix_length))
+            available += 1 << (32 - prefix_length)
 
 def main():
     try:
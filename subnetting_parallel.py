@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from subnetting import SubnetTable
+from subnetting_cli import parse_job
+
+
+def plan_job_bytes(job):
+    try:
+        planner, argument = parse_job(job)
+        networks, prefixes = planner.subnet_table(argument).tobytes()
+        return networks, prefixes, None
+    except (ValueError, TypeError, ZeroDivisionError) as e:
+        return b"", b"", str(e)
+
+
+def _plan_chunk(jobs):
+    return [plan_job_bytes(job) for job in jobs]
+
+
+def _chunks(jobs, chunk_size):
+    jobs = iter(jobs)
+    while True:
+        chunk = list(islice(jobs, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _decode(start, results):
+    for offset, (networks, prefixes, error) in enumerate(results):
+        if error is None:
+            yield start + offset, SubnetTable.frombytes(networks, prefixes), None
+        else:
+            yield start + offset, None, ValueError(error)
+
+
+def plan_parallel(jobs, workers=None, chunk_size=16, ordered=True, max_pending=None, executor=None):
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(workers)
+    try:
+        chunks = enumerate(_chunks(jobs, chunk_size))
+        pending = {}
+        finished = {}
+        next_chunk = 0
+
+        def submit():
+            for number, chunk in islice(chunks, max_pending - len(pending) - len(finished)):
+                pending[executor.submit(_plan_chunk, chunk)] = number
+
+        submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                number = pending.pop(future)
+                if ordered:
+                    finished[number] = future.result()
+                else:
+                    yield from _decode(number * chunk_size, future.result())
+            while next_chunk in finished:
+                yield from _decode(next_chunk * chunk_size, finished.pop(next_chunk))
+                next_chunk += 1
+            submit()
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,225 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+
+from subnetting import CIDR, SubnetTable, Subnetting, IPAddressConvert, subnetting_batch
+from subnetting_engine import AUTO, plan_tables
+
+MAGIC = b"SUBNPLAN"
+VERSION = 1
+PLAN_SUFFIX = ".snplan"
+MODES = ("CIDR", "VLSM")
+PACKED_FLAG = 1
+
+# magic, phiên bản, chế độ, cờ, địa chỉ mạng cha, prefix cha, số bản ghi, số yêu cầu
+HEADER = struct.Struct("<8sHBBIB3xQI4x")
+# Mỗi bản ghi 8 byte: địa chỉ mạng (uint32 LE) và prefix (uint32 LE) để đọc trực tiếp từ mmap
+RECORD_SIZE = 8
+LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _records_offset(num_requirements):
+    return (HEADER.size + 4 * num_requirements + 7) & ~7
+
+
+def _ordered(networks, prefixes):
+    if subnetting_batch is not None:
+        np = subnetting_batch.np
+        starts = np.frombuffer(networks, dtype=np.uint32).astype(np.int64)
+        ends = starts + (np.int64(1) << (32 - np.frombuffer(prefixes, dtype=np.uint8).astype(np.int64)))
+        return bool((ends[:-1] <= starts[1:]).all())
+    return all(networks[i] + (1 << (32 - prefixes[i])) <= networks[i + 1] for i in range(len(networks) - 1))
+
+
+class PlanWriter:
+    def __init__(self, path, ip, mask, mode, requirements=(), packed=False):
+        if mode not in MODES:
+            raise ValueError("Chế độ không hợp lệ.")
+        requirements = list(requirements)
+        if not all(isinstance(hosts, int) and 0 <= hosts <= 0xFFFFFFFF for hosts in requirements):
+            raise ValueError("Số host yêu cầu phải là số nguyên không âm.")
+        self.parent = Subnetting(ip, mask)
+        self.mode = mode
+        self.flags = PACKED_FLAG if packed else 0
+        self.requirements = array('I', requirements)
+        self.count = 0
+        self.next_network = self.parent.network_int
+        # Ghi ra tệp tạm và chỉ đổi tên khi hoàn tất để lỗi giữa chừng không để lại tệp kế hoạch dở dang
+        self.path = path
+        self.temp_path = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self.temp_path, 'wb')
+        self._write_header()
+        self.file.write(b"\0" * (_records_offset(len(self.requirements)) - self.file.tell()))
+
+    def _write_header(self):
+        requirements = self.requirements if LITTLE_ENDIAN else array('I', self.requirements)
+        if not LITTLE_ENDIAN:
+            requirements.byteswap()
+        self.file.write(HEADER.pack(MAGIC, VERSION, MODES.index(self.mode), self.flags, self.parent.network_int,
+                                    self.parent.mask, self.count, len(requirements)))
+        self.file.write(requirements.tobytes())
+
+    def write(self, table):
+        table = SubnetTable.from_prefixes(table)
+        count = len(table)
+        if not count:
+            return
+        # Bản ghi phải tăng dần và không chồng lấn để tra cứu nhị phân khi đọc
+        networks, prefixes = table.networks, table.prefixes
+        if networks[0] < self.next_network or not _ordered(networks, prefixes):
+            raise ValueError("Các mạng con phải được ghi theo thứ tự tăng dần và không chồng lấn.")
+        self.next_network = networks[-1] + (1 << (32 - prefixes[-1]))
+        records = array('I', bytes(count * RECORD_SIZE))
+        records[0::2] = networks
+        records[1::2] = array('I', prefixes)
+        if not LITTLE_ENDIAN:
+            records.byteswap()
+        self.file.write(records)
+        self.count += count
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self._write_header()
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        if self.file.closed:
+            return
+        self.file.close()
+        os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_plan(path, planner, argument, engine=AUTO, chunk_size=65536):
+    if isinstance(planner, CIDR):
+        mode, requirements = "CIDR", [argument]
+    else:
+        planner.sort_requirements(argument)
+        mode, requirements = "VLSM", argument
+    packed = getattr(planner, "packed", False)
+    with PlanWriter(path, planner.ip, planner.mask, mode, requirements, packed) as writer:
+        for table in plan_tables(planner, argument, engine, chunk_size):
+            writer.write(table)
+    return writer.count
+
+
+class PlanFile(Sequence):
+    # Đọc kế hoạch qua mmap: chỉ phân tích phần đầu tệp, các bản ghi được truy cập trực tiếp khi cần
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError("Tệp kế hoạch không hợp lệ.")
+        try:
+            self._load()
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError("Tệp kế hoạch không hợp lệ.")
+
+    def _load(self):
+        magic, version, mode, flags, network_int, prefix_length, count, num_requirements = \
+            HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION or mode >= len(MODES):
+            raise ValueError
+        offset = _records_offset(num_requirements)
+        if len(self.buffer) < offset + count * RECORD_SIZE:
+            raise ValueError
+        self.mode = MODES[mode]
+        self.packed = bool(flags & PACKED_FLAG)
+        self.network_int = network_int
+        self.prefix_length = prefix_length
+        self.requirements = array('I')
+        self.requirements.frombytes(self.buffer[HEADER.size:HEADER.size + 4 * num_requirements])
+        self.records = memoryview(self.buffer)[offset:offset + count * RECORD_SIZE]
+        if LITTLE_ENDIAN:
+            self.networks = self.records.cast('I')[0::2]
+        else:
+            self.requirements.byteswap()
+            records = array('I')
+            records.frombytes(self.records)
+            records.byteswap()
+            self.networks = records[0::2]
+        self.prefixes = self.records[4::RECORD_SIZE]
+
+    @property
+    def network(self):
+        return f"{IPAddressConvert.int_to_ip(self.network_int)}/{self.prefix_length}"
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def block(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PlanFile index out of range")
+        return self.networks[index], self.prefixes[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            networks = self.networks[index]
+            networks = networks.tobytes() if isinstance(networks, memoryview) else networks
+            return SubnetTable.frombytes(networks, self.prefixes[index].tobytes())
+        return Subnetting.details(*self.block(index))
+
+    def __iter__(self):
+        for start in range(0, len(self), 65536):
+            yield from self[start:start + 65536].to_dicts()
+
+    def iter_tables(self, chunk_size=65536):
+        for start in range(0, len(self), chunk_size):
+            yield self[start:start + chunk_size]
+
+    def index_of(self, address):
+        address_int = address if isinstance(address, int) else IPAddressConvert.ip_to_int(address.partition('/')[0])
+        index = bisect_right(self.networks, address_int) - 1
+        if index >= 0 and address_int < self.networks[index] + (1 << (32 - self.prefixes[index])):
+            return index
+        raise ValueError(f"{address} không thuộc kế hoạch chia mạng.")
+
+    def __contains__(self, address):
+        try:
+            self.index_of(address)
+        except ValueError:
+            return False
+        return True
+
+    def to_table(self):
+        return self[:]
+
+    def close(self):
+        for name in ("networks", "prefixes", "records"):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def open_plan(path):
+    return PlanFile(path)
@@ -0,0 +1,230 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+import subnetting
+
+ENV_VAR = "SUBNETTING_PROFILE"
+
+PHASE = "phase"
+HOT = "hot"
+
+# Các điểm đo: "phase" ghi từng lần gọi vào trace, "hot" (hàm gọi hàng triệu lần)
+# chỉ cộng dồn số lần gọi và thời gian
+TARGETS = [
+    (subnetting.IPAddressConvert, "ip_to_int", HOT),
+    (subnetting.IPAddressConvert, "int_to_ip", HOT),
+    (subnetting.IPAddressConvert, "ip_to_binary", HOT),
+    (subnetting.IPAddressConvert, "binary_to_ip", HOT),
+    (subnetting.Subnetting, "__init__", HOT),
+    (subnetting.Subnetting, "details", HOT),
+    (subnetting.Subnetting, "get_network_details", HOT),
+    (subnetting.CIDR, "split_prefix", PHASE),
+    (subnetting.CIDR, "subnet_table", PHASE),
+    (subnetting.VLSM, "subnet_table", PHASE),
+    (subnetting.CIDR, "plan", PHASE),
+    (subnetting.VLSM, "plan", PHASE),
+    (subnetting.SubnetTable, "to_dicts", PHASE),
+    (subnetting.SubnetTable, "to_columns", PHASE),
+]
+
+_active = None
+_installed = {}
+_lock = threading.Lock()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    def __init__(self):
+        self.origin = perf_counter()
+        self.events = []
+        self.timers = {}
+        self.counters = {}
+        self.allocations = {}
+        self.pid = os.getpid()
+
+    def record(self, name, start, end, blocks=None):
+        with _lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = [0, 0.0]
+            timer[0] += 1
+            timer[1] += end - start
+            if blocks is None:
+                return
+            self.allocations[name] = self.allocations.get(name, 0) + blocks
+            self.events.append({
+                "name": name, "cat": PHASE, "ph": "X", "pid": self.pid, "tid": threading.get_ident(),
+                "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6, "args": {"blocks": blocks},
+            })
+
+    def count(self, name, n=1):
+        with _lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def span(self, name):
+        blocks = sys.getallocatedblocks()
+        start = perf_counter()
+        try:
+            yield self
+        finally:
+            self.record(name, start, perf_counter(), sys.getallocatedblocks() - blocks)
+
+    def to_dict(self):
+        with _lock:
+            return {
+                "timers": {
+                    name: {"calls": calls, "total_ms": total * 1e3, "mean_us": total / calls * 1e6}
+                    for name, (calls, total) in sorted(self.timers.items(), key=lambda item: -item[1][1])
+                },
+                "counters": dict(self.counters),
+                "allocated_blocks": dict(self.allocations),
+            }
+
+    def to_chrome_trace(self):
+        end = (perf_counter() - self.origin) * 1e6
+        with _lock:
+            events = list(self.events)
+            hot = {name: calls for name, (calls, _) in self.timers.items() if name not in self.allocations}
+            counters = dict(self.counters)
+        events.append({"name": "calls", "ph": "C", "pid": self.pid, "tid": 0, "ts": end, "args": hot})
+        if counters:
+            events.append({"name": "counters", "ph": "C", "pid": self.pid, "tid": 0, "ts": end, "args": counters})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_chrome_trace(), file, ensure_ascii=False)
+
+
+def _wrap(name, function, kind):
+    if kind == PHASE:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return function(*args, **kwargs)
+            blocks = sys.getallocatedblocks()
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(name, start, perf_counter(), sys.getallocatedblocks() - blocks)
+    else:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(name, start, perf_counter())
+    return wrapper
+
+
+def _install(owner, attribute, kind):
+    key = (owner, attribute)
+    if key in _installed:
+        return
+    original = inspect.getattr_static(owner, attribute)
+    name = f"{owner.__name__}.{attribute}"
+    if isinstance(original, (staticmethod, classmethod)):
+        patched = type(original)(_wrap(name, original.__func__, kind))
+    else:
+        patched = _wrap(name, original, kind)
+    _installed[key] = original
+    setattr(owner, attribute, patched)
+
+
+def _uninstall():
+    for (owner, attribute), original in _installed.items():
+        setattr(owner, attribute, original)
+    _installed.clear()
+
+
+def register(owner, attribute, kind=PHASE):
+    TARGETS.append((owner, attribute, kind))
+    if _active is not None:
+        _install(owner, attribute, kind)
+
+
+def enable():
+    global _active
+    if _active is None:
+        _active = Profiler()
+        for owner, attribute, kind in TARGETS:
+            _install(owner, attribute, kind)
+    return _active
+
+
+def disable():
+    global _active
+    profiler, _active = _active, None
+    _uninstall()
+    return profiler
+
+
+def active():
+    return _active
+
+
+def span(name):
+    profiler = _active
+    return _NULL_SPAN if profiler is None else profiler.span(name)
+
+
+def count(name, n=1):
+    profiler = _active
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+@contextmanager
+def profile(json_path=None, trace_path=None):
+    profiler = enable()
+    try:
+        yield profiler
+    finally:
+        disable()
+        if json_path:
+            profiler.write_json(json_path)
+        if trace_path:
+            profiler.write_chrome_trace(trace_path)
+
+
+def enable_from_env():
+    value = os.environ.get(ENV_VAR, "").strip()
+    if not value or value == "0" or _active is not None:
+        return None
+    prefix = "subnetting_profile" if value == "1" else value
+    profiler = enable()
+
+    def write():
+        profiler.write_json(f"{prefix}.json")
+        profiler.write_chrome_trace(f"{prefix}.trace.json")
+
+    atexit.register(write)
+    return profiler
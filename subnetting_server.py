@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from subnetting import SubnetTable
+from subnetting_cache import PlanCache
+from subnetting_cli import parse_ip_mask, parse_job
+from subnetting_parallel import plan_job_bytes
+
+HEAVY_SUBNETS = 4096
+STREAM_ROWS = 8192
+MAX_BODY = 16 << 20
+CACHE_BYTES = 64 << 20
+
+ROUTES = {"/cidr": "CIDR", "/vlsm": "VLSM"}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class PlanningServer:
+    def __init__(self, host="127.0.0.1", port=8080, workers=None, executor=None, cache=None):
+        self.host = host
+        self.port = port
+        self.executor = executor or ProcessPoolExecutor(workers)
+        self.cache = cache if cache is not None else PlanCache(maxsize=1024, maxbytes=CACHE_BYTES)
+        self.in_flight = {}
+        self.connections = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            handlers = list(self.connections.values())
+            for writer in list(self.connections):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self.server.wait_closed()
+        self.executor.shutdown(cancel_futures=True)
+
+    async def plan(self, mode, body):
+        job = {"mode": mode, "ip_mask": body.get("ip_mask"), "extra_input": body.get("extra_input")}
+        planner, argument = parse_job(job)
+        size = argument if mode == "CIDR" else len(argument)
+        if mode == "VLSM":
+            argument = tuple(sorted(argument, reverse=True))
+        key = (mode, planner.network_int, planner.mask, argument)
+        cached = self.cache.get(mode, planner.ip, planner.mask, argument)
+        if cached is not None:
+            return cached
+
+        # Gộp các yêu cầu giống nhau đang được xử lý đồng thời
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(job, planner, argument, size))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _run(self, job, planner, argument, size):
+        if size < HEAVY_SUBNETS:
+            table = planner.subnet_table(list(argument) if isinstance(argument, tuple) else argument)
+        else:
+            loop = asyncio.get_running_loop()
+            networks, prefixes, error = await loop.run_in_executor(self.executor, plan_job_bytes, job)
+            if error is not None:
+                raise ValueError(error)
+            table = SubnetTable.frombytes(networks, prefixes)
+        return self.cache.put(job["mode"], planner.ip, planner.mask, argument, table)
+
+    async def handle(self, reader, writer):
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY:
+                    await self.send_json(writer, 413, {"error": "Yêu cầu quá lớn."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                await self.dispatch(method, urlsplit(target).path, body, writer, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+    async def dispatch(self, method, path, body, writer, keep_alive):
+        self.requests += 1
+        if path == "/stats" and method == "GET":
+            stats = {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self.in_flight),
+                     "cache": self.cache.stats()}
+            return await self.send_json(writer, 200, stats, keep_alive)
+        if path not in ROUTES and path != "/details":
+            return await self.send_json(writer, 404, {"error": "Không tìm thấy."}, keep_alive)
+        if method != "POST":
+            return await self.send_json(writer, 405, {"error": "Chỉ hỗ trợ POST."}, keep_alive)
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError("Nội dung yêu cầu phải là một đối tượng JSON.")
+            if path == "/details":
+                ip, mask = parse_ip_mask(request.get("ip_mask"))
+                return await self.send_json(writer, 200, dict(self.cache.network_details(ip, mask)), keep_alive)
+            table = await self.plan(ROUTES[path], request)
+        except (ValueError, TypeError, ZeroDivisionError) as e:
+            return await self.send_json(writer, 400, {"error": str(e)}, keep_alive)
+        await self.send_table(writer, table, keep_alive)
+
+    def _head(self, writer, status, keep_alive, extra):
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"{extra}\r\n".encode('latin-1')
+        )
+
+    async def send_json(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._head(writer, status, keep_alive, f"Content-Length: {len(body)}\r\n")
+        writer.write(body)
+        await writer.drain()
+
+    async def send_table(self, writer, table, keep_alive):
+        self._head(writer, 200, keep_alive, "Transfer-Encoding: chunked\r\n")
+
+        def chunk(text):
+            data = text.encode('utf-8')
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        chunk('{"subnets": [')
+        for start in range(0, len(table), STREAM_ROWS):
+            rows = json.dumps(table[start:start + STREAM_ROWS].to_dicts(), ensure_ascii=False)[1:-1]
+            chunk((', ' if start else '') + rows)
+            await writer.drain()
+        chunk(']}')
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+# Client HTTP tối giản dùng cho kiểm thử và bench_server
+async def read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding') == 'chunked':
+        parts = []
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            data = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            parts.append(data[:-2])
+        body = b''.join(parts)
+    else:
+        body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, body
+
+
+async def request(reader, writer, host, path, payload):
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    return await read_response(reader)
+
+
+async def serve(host, port, workers):
+    server = PlanningServer(host, port, workers)
+    await server.start()
+    print(f"Đang phục vụ tại http://{server.host}:{server.port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dịch vụ HTTP/JSON chia mạng CIDR/VLSM.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, help="Số tiến trình xử lý yêu cầu lớn")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
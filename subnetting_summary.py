@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+from subnetting import SubnetTable, subnetting_batch
+
+Summary = namedtuple("Summary", ["table", "covered", "over_coverage"])
+
+
+def _merge(starts, ends):
+    # Sắp xếp theo địa chỉ đầu rồi gộp các khoảng chồng lấn hoặc liền kề
+    order = sorted(range(len(starts)), key=starts.__getitem__)
+    merged_starts, merged_ends = [], []
+    for i in order:
+        start, end = starts[i], ends[i]
+        if merged_ends and start <= merged_ends[-1]:
+            if end > merged_ends[-1]:
+                merged_ends[-1] = end
+        else:
+            merged_starts.append(start)
+            merged_ends.append(end)
+    return merged_starts, merged_ends
+
+
+def _blocks(start, end):
+    # Tách khoảng [start, end) thành ít khối CIDR thẳng hàng nhất
+    while start < end:
+        size = start & -start if start else 1 << 32
+        while size > end - start:
+            size >>= 1
+        yield start, 33 - size.bit_length()
+        start += size
+
+
+def _summarize_python(table, max_prefix):
+    starts = [network for network in table.networks]
+    ends = [network + (1 << (32 - prefix)) for network, prefix in zip(table.networks, table.prefixes)]
+    merged_starts, merged_ends = _merge(starts, ends)
+    covered = sum(merged_ends) - sum(merged_starts)
+    if max_prefix is not None:
+        widened = [min(prefix, max_prefix) for prefix in table.prefixes]
+        starts = [network & ~((1 << (32 - prefix)) - 1) for network, prefix in zip(table.networks, widened)]
+        ends = [start + (1 << (32 - prefix)) for start, prefix in zip(starts, widened)]
+        merged_starts, merged_ends = _merge(starts, ends)
+
+    result = SubnetTable()
+    for start, end in zip(merged_starts, merged_ends):
+        for network, prefix in _blocks(start, end):
+            result.append(network, prefix)
+    return result, covered
+
+
+def _merge_numpy(np, starts, ends):
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    first = np.ones(starts.size, dtype=bool)
+    first[1:] = starts[1:] > reach[:-1]
+    groups = np.flatnonzero(first)
+    return starts[groups], np.maximum.reduceat(ends, groups)
+
+
+def _summarize_numpy(table, max_prefix):
+    np = subnetting_batch.np
+    networks = np.frombuffer(table.networks, dtype=np.uint32).astype(np.int64)
+    prefixes = np.frombuffer(table.prefixes, dtype=np.uint8).astype(np.int64)
+    starts, ends = _merge_numpy(np, networks, networks + (np.int64(1) << (32 - prefixes)))
+    covered = int((ends - starts).sum())
+    if max_prefix is not None:
+        prefixes = np.minimum(prefixes, max_prefix)
+        sizes = np.int64(1) << (32 - prefixes)
+        networks &= ~(sizes - 1)
+        starts, ends = _merge_numpy(np, networks, networks + sizes)
+
+    # Mỗi vòng cắt một khối thẳng hàng lớn nhất ở đầu mọi khoảng còn lại,
+    # tối đa 32 vòng cho không gian IPv4
+    out_networks, out_bits = [], []
+    while starts.size:
+        alignment = np.where(starts == 0, np.int64(1) << 32, starts & -starts)
+        _, exponent = np.frexp((ends - starts).astype(np.float64))
+        size = np.minimum(alignment, np.int64(1) << (exponent.astype(np.int64) - 1))
+        out_networks.append(starts)
+        out_bits.append(size)
+        starts = starts + size
+        remaining = starts < ends
+        starts, ends = starts[remaining], ends[remaining]
+
+    if not out_networks:
+        return SubnetTable(), covered
+    networks = np.concatenate(out_networks)
+    _, exponent = np.frexp(np.concatenate(out_bits).astype(np.float64))
+    order = np.argsort(networks, kind='stable')
+    result = SubnetTable()
+    result.networks.frombytes(networks[order].astype(np.uint32).tobytes())
+    result.prefixes.frombytes((33 - exponent[order]).astype(np.uint8).tobytes())
+    return result, covered
+
+
+def summarize(prefixes, max_prefix=None):
+    table = SubnetTable.from_prefixes(prefixes)
+    if max_prefix is not None and not 0 <= int(max_prefix) <= 32:
+        raise ValueError("Mặt nạ mạng không nằm trong khoảng 0 - 32")
+    if subnetting_batch is not None and len(table):
+        result, covered = _summarize_numpy(table, max_prefix)
+    else:
+        result, covered = _summarize_python(table, max_prefix)
+    total = sum(1 << (32 - prefix) for prefix in result.prefixes)
+    return Summary(result, covered, total - covered)
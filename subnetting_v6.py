@@ -0,0 +1,114 @@
+import ipaddress
+
+from subnetting import SubnetPlan, NETWORK_KEY, RANGE_KEY, BROADCAST_KEY, HOSTS_KEY
+
+MAX_ADDRESS = (1 << 128) - 1
+
+
+def ip6_to_int(ip):
+    return int(ipaddress.IPv6Address(ip))
+
+
+def int_to_ip6(value):
+    return ipaddress.IPv6Address(value).compressed
+
+
+def is_ip6(ip):
+    try:
+        ipaddress.IPv6Address(ip)
+    except ValueError:
+        return False
+    return True
+
+
+def is_mask6(mask):
+    return 0 < int(mask) <= 128
+
+
+class Subnetting6:
+    def __init__(self, ip, mask):
+        self.mask = int(mask)
+        if not 0 <= self.mask <= 128:
+            raise ValueError("Mặt nạ mạng không nằm trong khoảng 0 - 128")
+        self.ip_int = ip if isinstance(ip, int) else ip6_to_int(ip)
+        host_mask = (1 << (128 - self.mask)) - 1
+        self.network_int = self.ip_int & (MAX_ADDRESS ^ host_mask)
+        self.last_int = self.network_int | host_mask
+
+    @property
+    def network_address(self):
+        return int_to_ip6(self.network_int)
+
+    @staticmethod
+    def ceil_log2(x):
+        return 0 if x <= 1 else (int(x) - 1).bit_length()
+
+    @staticmethod
+    def details(network_int, mask):
+        # IPv6 không có địa chỉ broadcast: mọi địa chỉ trong mạng đều dùng được,
+        # cột broadcast giữ địa chỉ cuối để cùng lược đồ với IPv4
+        last_int = network_int | ((1 << (128 - mask)) - 1)
+        return {
+            NETWORK_KEY: f"{int_to_ip6(network_int)}/{mask}",
+            RANGE_KEY: f"{int_to_ip6(network_int)} - {int_to_ip6(last_int)}",
+            BROADCAST_KEY: int_to_ip6(last_int),
+            HOSTS_KEY: 1 << (128 - mask),
+        }
+
+    def get_network_details(self):
+        return self.details(self.network_int, self.mask)
+
+    def _plan(self, run_starts, run_networks, run_prefixes, size):
+        return SubnetPlan(run_starts, run_networks, run_prefixes, size, 128, self.details, ip6_to_int)
+
+
+class CIDR6(Subnetting6):
+    def __init__(self, ip, mask):
+        super().__init__(ip, mask)
+        self.prefix_length = None
+
+    def split_prefix(self, num_subnets):
+        num_subnets = int(num_subnets)
+        if num_subnets < 1:
+            raise ValueError("Số mạng con phải lớn hơn 0.")
+        total = 1 << (128 - self.mask)
+        if num_subnets > total:
+            raise ValueError(f"Không thể chia vì với {num_subnets} mạng con thì mỗi mạng có 0 địa chỉ khả dụng .")
+        self.prefix_length = 128 - ((total // num_subnets).bit_length() - 1)
+        return self.prefix_length
+
+    def plan(self, num_subnets):
+        prefix_length = self.split_prefix(num_subnets)
+        return self._plan([0], [self.network_int], [prefix_length], int(num_subnets))
+
+    def calculate_subnets(self, num_subnets):
+        return list(self.plan(num_subnets))
+
+    def iter_subnets(self, num_subnets, start=0, count=None):
+        plan = self.plan(num_subnets)
+        return iter(plan[start:] if count is None else plan[start:start + count])
+
+
+class VLSM6(Subnetting6):
+    def plan(self, host_requirements):
+        host_requirements.sort(reverse=True)
+        run_starts, run_networks, run_prefixes = [], [], []
+        available = self.network_int
+        for i, hosts in enumerate(host_requirements):
+            prefix_length = 128 - self.ceil_log2(hosts)
+            if prefix_length < self.mask or available + (1 << (128 - prefix_length)) - 1 > self.last_int:
+                raise ValueError("Không đủ địa chỉ để cấp phát cho yêu cầu.")
+            # Yêu cầu đã sắp giảm dần nên khối kế tiếp luôn thẳng hàng
+            if not run_prefixes or run_prefixes[-1] != prefix_length:
+                run_starts.append(i)
+                run_networks.append(available)
+                run_prefixes.append(prefix_length)
+            available += 1 << (128 - prefix_length)
+        return self._plan(run_starts, run_networks, run_prefixes, len(host_requirements))
+
+    def calculate_subnets(self, host_requirements):
+        return list(self.plan(host_requirements))
+
+    def iter_subnets(self, host_requirements, start=0, count=None):
+        plan = self.plan(host_requirements)
+        return iter(plan[start:] if count is None else plan[start:start + count])
@@ -0,0 +1,32 @@
+from bench_subnetting import run_suite, compare
+
+GRID = {"prefixes": (24,), "subnet_counts": (4,), "vlsm_sizes": (4,)}
+
+
+def test_run_suite_reports_time_and_memory():
+    results = run_suite(["subnetting"], GRID, repeat=2, warmup=0)
+    assert [record["case"] for record in results] == ["details", "cidr", "vlsm"]
+    for record in results:
+        assert record["median"] > 0 and record["p95"] >= record["median"] and record["peak_bytes"] > 0
+
+
+def test_compare_flags_regressions():
+    baseline = [{"engine": "e", "case": "cidr", "prefix": 8, "size": 4, "median": 0.010, "p95": 0.010, "peak_bytes": 1000}]
+    slower = [dict(baseline[0], median=0.020)]
+    assert compare(baseline, baseline) == []
+    assert [metric for _, metric, _, _ in compare(slower, baseline)] == ["median"]
+
+
+def test_run_suite_summary_case():
+    grid = {"prefixes": (), "subnet_counts": (), "vlsm_sizes": (), "summary_sizes": (100,)}
+    results = run_suite(["subnetting", "subnetting_lib"], grid, repeat=1, warmup=0)
+    assert [(record["engine"], record["case"]) for record in results] == [
+        ("subnetting", "summary"), ("subnetting_lib", "summary"),
+    ]
+
+
+def test_run_suite_calibration_times_table_path():
+    grid = {"prefixes": (24,), "subnet_counts": (4,), "vlsm_sizes": (4,)}
+    results = run_suite(["subnetting", "subnetting_lib"], grid, repeat=1, warmup=0, tables=True)
+    assert {record.get("path") for record in results if record["case"] != "details"} == {"tables"}
+    assert all("error" not in record for record in results)
@@ -56,3 +56,77 @@ def test_vlsm_calculate_subnets():
         {"Địa chỉ mạng": "192.168.1.128/28", "Dải địa chỉ": "192.168.1.129 - 192.168.1.142", "Địa chỉ broadcast": "192.168.1.143", "Số lượng host": 14},
     ]
     assert subnets == expected_subnets
+
+
+def test_cidr_iter_subnets_window():
+    cidr = CIDR("10.0.0.0", 8)
+    subnets = list(cidr.iter_subnets(1000000, start=5, count=2))
+    assert [subnet["Địa chỉ mạng"] for subnet in subnets] == ["10.0.0.80/28", "10.0.0.96/28"]
+    assert cidr.prefix_length == 28
+
+
+def test_vlsm_iter_subnets_window():
+    vlsm = VLSM("192.168.1.0", 24)
+    subnets = list(vlsm.iter_subnets([10, 60, 30], start=1))
+    assert [subnet["Địa chỉ mạng"] for subnet in subnets] == ["192.168.1.64/26", "192.168.1.128/28"]
+
+
+def test_cidr_subnet_table():
+    cidr = CIDR("192.168.1.0", 24)
+    table = cidr.subnet_table(4)
+    assert len(table) == 4
+    assert table.to_dicts() == cidr.calculate_subnets(4)
+    assert table[1] == cidr.calculate_subnets(4)[1]
+    assert table[-1]["Địa chỉ broadcast"] == "192.168.1.255"
+    assert table[2].num_hosts == 62
+    assert len(table[1:3]) == 2
+
+
+def test_subnet_table_is_compact():
+    table = CIDR("10.0.0.0", 8).subnet_table(1 << 20)
+    assert table.nbytes == 5 * (1 << 20)
+    assert table[-1]["Địa chỉ mạng"] == "10.255.255.240/28"
+
+
+def test_iter_tables_chunks_match_subnet_table():
+    chunks = list(CIDR("10.0.0.0", 8).iter_tables(10000, chunk_size=4096))
+    assert [len(chunk) for chunk in chunks] == [4096, 4096, 1808]
+    assert [row.network_int for chunk in chunks for row in chunk] == list(CIDR("10.0.0.0", 8).subnet_table(10000).networks)
+
+    requirements = [10, 60, 30, 2, 2]
+    chunks = list(VLSM("192.168.1.0", 24).iter_tables(list(requirements), chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [row.to_dict() for chunk in chunks for row in chunk] == VLSM("192.168.1.0", 24).calculate_subnets(requirements)
+
+
+def test_vlsm_packed_mode_uses_tightest_blocks():
+    requirements = [10, 60, 30]
+    vlsm = VLSM("192.168.1.0", 24, packed=True)
+    table = vlsm.subnet_table(requirements)
+    assert [row["Địa chỉ mạng"] for row in table] == ["192.168.1.0/26", "192.168.1.64/27", "192.168.1.96/28"]
+    assert vlsm.usage(requirements, table) == {
+        "requested_hosts": 100, "allocated_addresses": 112, "wasted_addresses": 6,
+        "free_addresses": 144, "utilization": 100 / 112,
+    }
+    assert list(VLSM("192.168.1.0", 24, packed=True).plan([10, 60, 30])) == table.to_dicts()
+
+    requirements = [100] * 2 + [2] * 12000 + [500] * 30
+    table = VLSM("10.0.0.0", 16, packed=True).subnet_table(requirements)
+    assert len(table) == 12032 and table[-1]["Địa chỉ mạng"] == "10.0.248.124/30"
+    with pytest.raises(ValueError):
+        VLSM("192.168.1.0", 24, packed=True).subnet_table([100, 100, 10])
+
+
+def test_vlsm_rejects_blocks_past_parent_network():
+    for ip in ("255.255.255.0", "10.0.0.0"):
+        with pytest.raises(ValueError):
+            VLSM(ip, 24).calculate_subnets([100, 100, 100])
+
+
+def test_vlsm_overflow_is_reported_before_streaming():
+    vlsm = VLSM("192.168.1.0", 24)
+    with pytest.raises(ValueError):
+        vlsm.iter_tables([100, 100, 100], 1)
+    with pytest.raises(ValueError):
+        vlsm.iter_subnets([100, 100, 100])
+    assert len(vlsm.subnet_table([100, 100])) == 2
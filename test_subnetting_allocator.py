@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from subnetting import VLSM
+from subnetting_allocator import SubnetAllocator, IncrementalVLSM
+
+
+def test_allocate_matches_tight_vlsm_blocks():
+    allocator = SubnetAllocator("192.168.1.0", 24)
+    assert allocator.allocate(60)["Địa chỉ mạng"] == "192.168.1.0/26"
+    assert allocator.allocate(10)["Địa chỉ mạng"] == "192.168.1.64/28"
+    assert allocator.allocate_prefix(25)["Địa chỉ mạng"] == "192.168.1.128/25"
+    assert allocator.allocate(2)["Địa chỉ mạng"] == "192.168.1.80/30"
+    assert allocator.allocate_block(32) == 0xC0A80154
+    assert [row["Địa chỉ mạng"] for row in allocator.free_blocks()] == [
+        "192.168.1.85/32", "192.168.1.86/31", "192.168.1.88/29", "192.168.1.96/27",
+    ]
+
+    assert list(VLSM("192.168.1.0", 24).iter_blocks([10, 60])) == [(0xC0A80100, 26), (0xC0A80140, 28)]
+
+
+def test_release_coalesces_buddies():
+    allocator = SubnetAllocator("10.0.0.0", 12)
+    blocks = [allocator.allocate(random.Random(i).randint(1, 5000)) for i in range(200)]
+    for block in random.Random(1).sample(blocks, len(blocks)):
+        allocator.release(block)
+    assert [row["Địa chỉ mạng"] for row in allocator.free_blocks()] == ["10.0.0.0/12"]
+    assert allocator.free_addresses == 1 << 20
+
+
+def test_allocator_errors():
+    allocator = SubnetAllocator("192.168.1.0", 24)
+    allocator.allocate_prefix(24)
+    with pytest.raises(ValueError):
+        allocator.allocate(1)
+    with pytest.raises(ValueError):
+        allocator.release("192.168.1.0/25")
+    allocator.release("192.168.1.0/24")
+    with pytest.raises(ValueError):
+        allocator.release("192.168.1.0/24")
+
+
+def test_incremental_vlsm_keeps_existing_subnets():
+    host_requirements = [60, 30, 10]
+    subnets = VLSM("192.168.1.0", 24).calculate_subnets(host_requirements)
+    plan = IncrementalVLSM.from_plan("192.168.1.0", 24, subnets, host_requirements)
+    change = plan.apply(added=[20], removed=[10])
+    assert [s["Địa chỉ mạng"] for s in change["removed"]] == ["192.168.1.128/28"]
+    assert [s["Địa chỉ mạng"] for s in change["added"]] == ["192.168.1.128/27"]
+    assert change["moved"] == []
+    assert [row["Địa chỉ mạng"] for row in plan.subnet_table()] == [
+        "192.168.1.0/26", "192.168.1.64/26", "192.168.1.128/27",
+    ]
+    assert plan.host_requirements() == [60, 30, 20]
+
+
+def test_incremental_vlsm_moves_only_when_fragmented():
+    plan = IncrementalVLSM.from_plan("10.0.0.0", 24, ["10.0.0.64/30", "10.0.0.192/30"], [2, 2])
+    before = plan.free_addresses
+    change = plan.apply(added=[100])
+    assert [s["Địa chỉ mạng"] for s in change["added"]] == ["10.0.0.0/25"]
+    assert [(old["Địa chỉ mạng"], new["Địa chỉ mạng"]) for old, new in change["moved"]] == [
+        ("10.0.0.64/30", "10.0.0.196/30"),
+    ]
+    assert plan.free_addresses == before - 128
+    with pytest.raises(ValueError):
+        plan.apply(added=[10, 200])
+    assert plan.free_addresses == before - 128
+    assert sorted(plan.host_requirements()) == [2, 2, 100]
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from subnetting import Subnetting, CIDR
+from subnetting_batch import parse_ips, parse_cidrs, format_ips, network_details, parse_buffer, subnet_bases, details_to_dicts
+
+
+def test_parse_and_format_ips():
+    ips = ["0.0.0.0", "10.0.0.1", "192.168.1.10", "255.255.255.255"]
+    addresses = parse_ips(ips)
+    assert addresses.dtype == np.uint32
+    assert addresses.tolist() == [0, 167772161, 3232235786, 4294967295]
+    assert format_ips(addresses).tolist() == ips
+
+
+def test_parse_rejects_malformed():
+    for bad in ["1.2.3", "1.2.3.256", "1..2.3", "1.2.3.4/24", "a.b.c.d", "1.2.3.4 "]:
+        with pytest.raises(ValueError):
+            parse_ips([bad])
+    with pytest.raises(ValueError):
+        parse_cidrs(["1.2.3.4/33"])
+
+
+def test_parse_buffer_marks_invalid_and_blank_lines():
+    addresses, prefixes, valid, has_prefix, blank = parse_buffer(b"1.2.3.4\r\n\n10.0.0.0/8\nxx\n")
+    assert valid.tolist() == [True, False, True, False]
+    assert blank.tolist() == [False, True, False, False]
+    assert prefixes[2] == 8 and has_prefix[2]
+
+
+def test_network_details_matches_subnetting():
+    addresses, prefixes = parse_cidrs(["192.168.1.10/24", "10.1.2.3/8", "172.16.5.4/30"])
+    details = network_details(addresses, prefixes)
+    for i, (ip, mask) in enumerate([("192.168.1.10", 24), ("10.1.2.3", 8), ("172.16.5.4", 30)]):
+        subnet = Subnetting(ip, mask)
+        assert details["network"][i] == subnet.network_int
+        assert details["broadcast"][i] == subnet.broadcast_int
+        assert details["num_hosts"][i] == subnet.calculate_num_hosts(mask)
+
+
+def test_details_columns_point_to_point():
+    addresses, prefixes = parse_cidrs(["10.0.0.0/31", "10.0.0.7/32"])
+    assert details_to_dicts(addresses, prefixes) == [
+        Subnetting.details(int(address), int(prefix)) for address, prefix in zip(addresses, prefixes)
+    ]
+    assert [row["Số lượng host"] for row in details_to_dicts(addresses, prefixes)] == [2, 1]
+
+
+def test_cidr_tables_use_vectorized_bases():
+    cidr = CIDR("10.0.0.0", 8)
+    expected = list(cidr.iter_subnets(5000))
+    assert subnet_bases(cidr.network_int, cidr.prefix_length, 3).tolist() == [0x0A000000, 0x0A000800, 0x0A001000]
+    assert cidr.subnet_table(5000).networks.tolist() == list(range(0x0A000000, 0x0B000000, 0x800))[:5000]
+    assert [row for table in cidr.iter_tables(5000, 4500) for row in table.to_dicts()] == expected
+    assert cidr.calculate_subnets(5000) == expected
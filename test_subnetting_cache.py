@@ -0,0 +1,64 @@
+import pytest
+
+from subnetting import CIDR, VLSM, Subnetting
+from subnetting_cache import PlanCache
+
+
+def test_cache_hits_and_immutable_results():
+    cache = PlanCache(maxsize=4)
+    subnets = cache.calculate_cidr("192.168.1.0", 24, 4)
+    assert list(subnets) == CIDR("192.168.1.0", 24).calculate_subnets(4)
+    assert cache.calculate_cidr("192.168.1.77", "24", 4) is subnets
+    with pytest.raises(TypeError):
+        subnets[0]["Số lượng host"] = 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_vlsm_cache_does_not_sort_caller_list():
+    cache = PlanCache()
+    host_requirements = [10, 60, 30]
+    subnets = cache.calculate_vlsm("192.168.1.0", 24, host_requirements)
+    assert host_requirements == [10, 60, 30]
+    assert list(subnets) == VLSM("192.168.1.0", 24).calculate_subnets([60, 30, 10])
+    assert cache.calculate_vlsm("192.168.1.0", 24, [30, 10, 60]) is subnets
+    assert cache.network_details("192.168.1.10", 24) == Subnetting("192.168.1.10", 24).get_network_details()
+
+
+def test_lru_eviction_ttl_and_disk_tier(tmp_path):
+    path = str(tmp_path / "plans.sqlite")
+    cache = PlanCache(maxsize=2, path=path)
+    for count in (2, 4, 8):
+        cache.calculate_cidr("10.0.0.0", 8, count)
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+    cache.close()
+
+    warm = PlanCache(maxsize=2, path=path)
+    assert len(warm.calculate_cidr("10.0.0.0", 8, 2)) == 2
+    assert warm.stats()["disk_hits"] == 1 and warm.stats()["misses"] == 0
+
+    expired = PlanCache(path=path, ttl=0)
+    expired.calculate_cidr("10.0.0.0", 8, 2)
+    assert expired.stats()["misses"] == 1
+
+
+def test_cached_plan_is_compact_and_bounded_by_bytes():
+    cache = PlanCache(maxbytes=5 * 1024 * 5)
+    subnets = cache.calculate_cidr("10.0.0.0", 8, 1024)
+    assert subnets.nbytes == 1024 * 5 and len(subnets) == 1024
+    assert subnets[1:3].to_dicts() == CIDR("10.0.0.0", 8).calculate_subnets(1024)[1:3]
+    assert subnets.to_table().to_dicts() == subnets.to_dicts()
+    for count in (2048, 4096):
+        cache.calculate_cidr("10.0.0.0", 8, count)
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["size"] == 1 and stats["bytes"] == 4096 * 5
+
+
+def test_cached_plan_exposes_no_backing_arrays():
+    cache = PlanCache()
+    subnets = cache.calculate_cidr("10.0.0.0", 24, 4)
+    with pytest.raises(AttributeError):
+        subnets[0].table
+    copy = subnets.to_table()
+    copy.networks[0] = 0xC0A80100
+    assert cache.calculate_cidr("10.0.0.0", 24, 4)[0]["Địa chỉ mạng"] == "10.0.0.0/26"
+    assert subnets[0:1].to_table().networks[0] == subnets[0].network_int
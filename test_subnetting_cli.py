@@ -0,0 +1,88 @@
+import gzip
+import io
+import json
+
+from subnetting import CIDR
+from subnetting_cli import CsvWriter, JsonlWriter, main, run_jobs
+
+
+def test_run_jobs_jsonl_reports_errors_inline():
+    lines = [
+        '{"mode": "CIDR", "ip_mask": "192.168.1.0/24", "extra_input": 4}\n',
+        'not json\n',
+        '{"mode": "VLSM", "ip_mask": "192.168.1.0/24", "extra_input": "60,30,10"}\n',
+        '{"mode": "CIDR", "ip_mask": "192.168.1.0/33", "extra_input": 4}\n',
+    ]
+    out = io.StringIO()
+    assert run_jobs(lines, out) == 2
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["job"] for record in records] == [1, 2, 3, 4]
+    assert len(records[0]["subnets"]) == 4
+    assert records[0]["subnets"][1]["Địa chỉ mạng"] == "192.168.1.64/26"
+    assert "error" in records[1] and "error" in records[3]
+    assert records[2]["subnets"][2]["Số lượng host"] == 14
+
+
+def test_run_jobs_csv():
+    lines = io.StringIO('mode,ip_mask,extra_input\nCIDR,10.0.0.0/8,2\nVLSM,10.0.0.0/30,"500"\n')
+    out = io.StringIO()
+    assert run_jobs(lines, out, "csv", "csv") == 1
+    rows = out.getvalue().splitlines()
+    assert rows[1].startswith("1,CIDR,10.0.0.0/8,1,10.0.0.0/9,")
+    assert rows[3].startswith("2,VLSM,10.0.0.0/30,,")
+    assert len(rows) == 4
+
+
+def test_run_jobs_packed_overflow_reported_inline():
+    lines = [
+        '{"mode": "VLSM", "ip_mask": "192.168.1.0/24", "extra_input": "100,100,10", "packed": true}\n',
+        '{"mode": "CIDR", "ip_mask": "192.168.1.0/24", "extra_input": 2}\n',
+    ]
+    out = io.StringIO()
+    assert run_jobs(lines, out) == 1
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert "error" in records[0] and "subnets" not in records[0]
+    assert len(records[1]["subnets"]) == 2
+
+
+def test_run_jobs_legacy_overflow_does_not_abort_batch():
+    lines = [
+        '{"mode": "VLSM", "ip_mask": "192.168.1.0/24", "extra_input": "100,100,100"}\n',
+        '{"mode": "CIDR", "ip_mask": "192.168.1.0/24", "extra_input": 2}\n',
+    ]
+    out = io.StringIO()
+    assert run_jobs(lines, out) == 1
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert "error" in records[0] and "subnets" not in records[0]
+    assert len(records[1]["subnets"]) == 2
+    out = io.StringIO()
+    assert run_jobs(lines, out, "jsonl", "csv") == 1
+    rows = out.getvalue().splitlines()
+    assert rows[1].startswith("1,VLSM,192.168.1.0/24,,") and rows[2].startswith("2,CIDR,")
+
+
+def test_writers_close_record_on_mid_stream_error():
+    def tables():
+        yield CIDR("10.0.0.0", 24).subnet_table(2)
+        raise ValueError("hỏng")
+
+    job = {"mode": "CIDR", "ip_mask": "10.0.0.0/24"}
+    out = io.StringIO()
+    assert isinstance(JsonlWriter(out).write_job(1, job, tables()), ValueError)
+    record = json.loads(out.getvalue())
+    assert len(record["subnets"]) == 2 and record["error"] == "hỏng"
+    out = io.StringIO()
+    assert isinstance(CsvWriter(out).write_job(1, job, tables()), ValueError)
+    assert out.getvalue().splitlines()[-1].endswith(",hỏng")
+
+
+def test_main_picks_formats_from_extensions(tmp_path):
+    source = tmp_path / "jobs.json"
+    source.write_text('{"mode": "CIDR", "ip_mask": "10.0.0.0/24", "extra_input": 2}\n', encoding="utf-8")
+    assert main([str(source), "-o", str(tmp_path / "out.csv.gz")]) == 0
+    with gzip.open(tmp_path / "out.csv.gz", "rt", encoding="utf-8") as file:
+        assert file.readline().startswith("job,mode,ip_mask,subnet,")
+    assert main(["--mode", "CIDR", "--ip-mask", "10.0.0.0/24", "--extra-input", "2",
+                 "-o", str(tmp_path / "plan.jsonl.gz")]) == 0
+    with gzip.open(tmp_path / "plan.jsonl.gz", "rt", encoding="utf-8") as file:
+        assert json.loads(file.readline())["Địa chỉ mạng"] == "10.0.0.0/25"
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from subnetting_conflicts import Inventory, find_conflicts, EQUAL, CONTAINS, INSIDE
+
+
+def test_find_conflicts_reports_every_pair():
+    inventory = ["10.0.0.0/16", "10.0.1.0/24", "10.0.1.128/25", "10.1.0.0/24", "192.168.0.0/24"]
+    plan = ["10.0.1.0/24", "10.0.0.0/8", "172.16.0.0/12"]
+    assert sorted(find_conflicts(inventory, plan)) == [
+        (0, 0, INSIDE), (0, 1, EQUAL), (0, 2, CONTAINS),
+        (1, 0, CONTAINS), (1, 1, CONTAINS), (1, 2, CONTAINS), (1, 3, CONTAINS),
+    ]
+
+
+def test_find_conflicts_matches_brute_force():
+    rng = random.Random(7)
+
+    def prefixes(count, shortest):
+        result = []
+        for _ in range(count):
+            prefix = rng.randint(shortest, 30)
+            result.append(((0x0A000000 + rng.randrange(1 << 16)) & ~((1 << (32 - prefix)) - 1), prefix))
+        return result
+
+    inventory, plan = prefixes(400, 18), prefixes(100, 16)
+    expected = []
+    for i, (plan_net, plan_prefix) in enumerate(plan):
+        plan_end = plan_net + (1 << (32 - plan_prefix))
+        for j, (net, prefix) in enumerate(inventory):
+            end = net + (1 << (32 - prefix))
+            if net < plan_end and plan_net < end:
+                if (net, end) == (plan_net, plan_end):
+                    expected.append((i, j, EQUAL))
+                else:
+                    expected.append((i, j, CONTAINS if plan_net <= net and end <= plan_end else INSIDE))
+    assert sorted(find_conflicts(inventory, plan)) == sorted(expected)
+
+
+def test_planning_skips_occupied_ranges():
+    inventory = Inventory(["192.168.1.0/26", "192.168.1.64/28", "192.168.1.200/29", "10.0.0.0/8"])
+    table = inventory.plan_cidr("192.168.1.0", 24, 4)
+    assert [row["Địa chỉ mạng"] for row in table] == [
+        "192.168.1.96/27", "192.168.1.128/27", "192.168.1.160/27", "192.168.1.224/27",
+    ]
+    assert inventory.conflicts(table) == []
+
+    table = inventory.plan_vlsm("192.168.1.0", 24, [10, 20, 5])
+    assert [row["Địa chỉ mạng"] for row in table] == ["192.168.1.96/27", "192.168.1.224/27", "192.168.1.192/29"]
+    assert inventory.conflicts(table) == []
+
+    assert inventory.is_free(0xC0A801C0, 26) is False and inventory.is_free(0xC0A80180, 26)
+    with pytest.raises(ValueError):
+        inventory.plan_vlsm("192.168.1.0", 24, [100])
+    with pytest.raises(ValueError):
+        inventory.plan_cidr("10.1.0.0", 16, 2)
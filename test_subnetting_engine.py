@@ -0,0 +1,59 @@
+import pytest
+
+import subnetting_engine
+from subnetting import CIDR, VLSM
+from subnetting_engine import differential, get_engine, load_calibration, plan_tables, random_cases
+
+
+@pytest.fixture(autouse=True)
+def clear_calibration():
+    subnetting_engine.CALIBRATION.clear()
+    yield
+    subnetting_engine.CALIBRATION.clear()
+
+
+def test_backends_agree_on_random_inputs():
+    assert differential(random_cases(300, seed=7)) == []
+
+
+def test_lib_engine_matches_reported_edge_cases():
+    cases = [
+        ("vlsm", "192.168.1.0", 24, [60, 30, 10]),
+        ("vlsm", "10.0.0.0", 24, [60, 30, 14]),
+        ("vlsm", "255.255.255.0", 24, [100, 100, 100]),
+        ("details", "10.0.0.1", 31, None),
+        ("details", "10.0.0.1", 32, None),
+        ("cidr", "10.0.0.0", 24, 128),
+    ]
+    assert differential(cases) == []
+    lib = subnetting_engine.ENGINES["subnetting_lib"]
+    assert lib.supports("vlsm", 24, 3) and not lib.supports("vlsm", 24, 3, packed=True)
+
+
+def test_auto_uses_calibration_data():
+    assert get_engine("auto", "cidr", 24, 16).name == "subnetting"
+    load_calibration({"results": [
+        {"engine": "subnetting", "case": "cidr", "prefix": 24, "size": 16, "median": 0.002, "path": "tables"},
+        {"engine": "subnetting_lib", "case": "cidr", "prefix": 24, "size": 16, "median": 0.001, "path": "tables"},
+        {"engine": "subnetting_lib", "case": "vlsm", "prefix": 24, "size": 4, "median": 0.0001},
+        {"engine": "subnetting", "case": "vlsm", "prefix": 24, "size": 4, "median": 0.002},
+    ]})
+    assert get_engine("auto", "cidr", 23, 20).name == "subnetting_lib"
+    # Record VLSM không đo qua iter_tables nên không được dùng để chọn engine
+    assert get_engine("auto", "vlsm", 24, 4).name == "subnetting"
+    assert get_engine("auto", "vlsm", 24, 4, packed=True).name == "subnetting"
+
+
+def test_plan_tables_matches_planner():
+    expected = CIDR("10.0.0.0", 16).subnet_table(1000)
+    for engine in subnetting_engine.ENGINES:
+        tables = plan_tables(CIDR("10.0.0.0", 16), 1000, engine, chunk_size=256)
+        first = next(tables)
+        assert len(first) == 256
+        tables = [first, *tables]
+        assert [len(table) for table in tables] == [256, 256, 256, 232]
+        assert [row for table in tables for row in table.networks] == list(expected.networks)
+        vlsm = list(plan_tables(VLSM("10.0.0.0", 24), [60, 30, 10], engine))
+        assert vlsm[0].networks == VLSM("10.0.0.0", 24).subnet_table([60, 30, 10]).networks
+    tables = list(plan_tables(VLSM("10.0.0.0", 24, packed=True), [10, 60, 30]))
+    assert [row["Địa chỉ mạng"] for row in tables[0]] == ["10.0.0.0/26", "10.0.0.64/27", "10.0.0.96/28"]
@@ -0,0 +1,46 @@
+import csv
+import gzip
+import io
+import json
+
+from subnetting import CIDR, VLSM, DETAIL_KEYS
+from subnetting_cli import main
+from subnetting_export import export, iter_chunks, write_json
+
+
+def test_export_formats_match_dict_schema(tmp_path):
+    subnets = VLSM("192.168.1.0", 24).calculate_subnets([60, 30, 10])
+    table = VLSM("192.168.1.0", 24).subnet_table([60, 30, 10])
+
+    assert export(table, str(tmp_path / "plan.json")) == 3
+    assert json.loads((tmp_path / "plan.json").read_text(encoding="utf-8")) == subnets
+
+    assert export(iter(subnets), str(tmp_path / "plan.jsonl.gz")) == 3
+    with gzip.open(tmp_path / "plan.jsonl.gz", "rt", encoding="utf-8") as file:
+        assert [json.loads(line) for line in file] == subnets
+
+    export(table, str(tmp_path / "plan.csv"))
+    with open(tmp_path / "plan.csv", encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == list(DETAIL_KEYS)
+    assert rows[2]["Địa chỉ mạng"] == "192.168.1.128/28"
+    assert rows[2]["Số lượng host"] == "14"
+
+
+def test_export_streams_table_chunks():
+    chunks = CIDR("10.0.0.0", 8).iter_tables(20000, chunk_size=4096)
+    sizes = [len(chunk) for chunk in iter_chunks(chunks, chunk_rows=3000)]
+    assert sum(sizes) == 20000 and max(sizes) <= 3000
+
+    out = io.StringIO()
+    assert write_json(CIDR("10.0.0.0", 8).iter_tables(5000), out, chunk_rows=1000) == 5000
+    assert json.loads(out.getvalue()) == CIDR("10.0.0.0", 8).calculate_subnets(5000)
+
+
+def test_cli_exports_single_plan(tmp_path):
+    path = tmp_path / "plan.csv.gz"
+    assert main(["--mode", "CIDR", "--ip-mask", "10.0.0.0/8", "--extra-input", "1000", "-o", str(path)]) == 0
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        rows = file.read().splitlines()
+    assert len(rows) == 1001
+    assert rows[-1].startswith("10.249.192.0/18,")
@@ -0,0 +1,43 @@
+import random
+
+from subnetting import CIDR, VLSM, IPAddressConvert
+from subnetting_index import PrefixIndex
+
+
+def brute_force(prefixes, ip_int):
+    best, best_len = -1, -1
+    for i, (network_int, prefix_length) in enumerate(prefixes):
+        if ip_int >> (32 - prefix_length) == network_int >> (32 - prefix_length) and prefix_length > best_len:
+            best, best_len = i, prefix_length
+    return best
+
+
+def test_lookup_planned_subnets():
+    index = PrefixIndex(VLSM("192.168.1.0", 24).calculate_subnets([60, 30, 10]))
+    assert index.lookup("192.168.1.70")["Địa chỉ mạng"] == "192.168.1.64/26"
+    assert index.lookup("192.168.1.143")["Địa chỉ mạng"] == "192.168.1.128/28"
+    assert index.lookup("192.168.1.144") is None
+    assert index.lookup("10.0.0.1") is None
+
+
+def test_longest_prefix_match_with_overlaps():
+    rng = random.Random(0)
+    prefixes = []
+    for _ in range(300):
+        prefix_length = rng.randint(8, 32)
+        network_int = rng.getrandbits(32) & (0xFFFFFFFF ^ ((1 << (32 - prefix_length)) - 1))
+        if rng.random() < 0.5:
+            network_int = (10 << 24) | (network_int & 0xFFFFFF)
+        prefixes.append((network_int, prefix_length))
+    index = PrefixIndex(prefixes)
+    addresses = [rng.getrandbits(32) for _ in range(500)]
+    addresses += [network_int + rng.randrange(1 << (32 - p)) for network_int, p in prefixes]
+    expected = [brute_force(prefixes, ip_int) for ip_int in addresses]
+    assert [index.lookup_index(ip_int) for ip_int in addresses] == expected
+    assert list(index.lookup_many(addresses)) == expected
+
+
+def test_lookup_from_cidr_table():
+    table = CIDR("10.0.0.0", 8).subnet_table(65536)
+    index = PrefixIndex(table)
+    assert index.lookup(IPAddressConvert.ip_to_int("10.1.2.3"))["Địa chỉ mạng"] == "10.1.2.0/24"
@@ -0,0 +1,38 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from subnetting_ingest import ingest_file, ingest_buffer
+
+
+def test_ingest_file_collects_malformed_lines(tmp_path):
+    path = tmp_path / "dump.txt"
+    path.write_bytes(b"10.0.0.1\n192.168.1.0/24\n\nbad line\r\n1.2.3.256\n172.16.0.0/12\r\n8.8.8.8")
+    result = ingest_file(str(path))
+    assert result.addresses.tolist() == [167772161, 3232235776, 2886729728, 134744072]
+    assert result.prefixes.tolist() == [32, 24, 12, 32]
+    assert list(result.malformed) == [4, 5]
+
+
+def test_ingest_modes_and_small_chunks():
+    data = b"".join(f"10.{i // 256}.{i % 256}.0/24\n".encode() for i in range(5000)) + b"1.2.3.4\n"
+    result = ingest_buffer(data, mode="cidr", chunk_size=64)
+    assert result.addresses.size == 5000
+    assert result.addresses[-1] == (10 << 24) | (19 << 16) | (135 << 8)
+    assert list(result.malformed) == [5001]
+    assert ingest_buffer(data, mode="ip").addresses.tolist() == [0x01020304]
+
+
+def test_ingest_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert ingest_file(str(path)).addresses.size == 0
+
+
+def test_ingest_bare_carriage_returns():
+    result = ingest_buffer(b"1.2.3.4\r5.6.7.8\r")
+    assert result.addresses.tolist() == [0x01020304, 0x05060708] and list(result.malformed) == []
+    data = b"".join(f"10.0.{i}.0/24\r".encode() for i in range(200)) + b"bad\r\n10.1.0.0/16\r\n"
+    result = ingest_buffer(data, chunk_size=32)
+    assert result.addresses.size == 201 and list(result.malformed) == [201]
+    assert result.prefixes[-1] == 16
@@ -0,0 +1,23 @@
+import subnetting
+import subnetting_lib
+
+
+def test_point_to_point_and_host_routes():
+    assert subnetting_lib.Subnetting("10.0.0.1", 31).get_network_details() == {
+        "Địa chỉ mạng": "10.0.0.0/31",
+        "Dải địa chỉ": "10.0.0.0 - 10.0.0.1",
+        "Địa chỉ broadcast": "10.0.0.1",
+        "Số lượng host": 2,
+    }
+    assert subnetting_lib.Subnetting("10.0.0.7", 32).get_network_details() == {
+        "Địa chỉ mạng": "10.0.0.7/32",
+        "Dải địa chỉ": "10.0.0.7 - 10.0.0.7",
+        "Địa chỉ broadcast": "10.0.0.7",
+        "Số lượng host": 1,
+    }
+
+
+def test_details_match_native_engine():
+    for mask in (8, 24, 30, 31, 32):
+        assert (subnetting_lib.Subnetting("10.1.2.3", mask).get_network_details()
+                == subnetting.Subnetting("10.1.2.3", mask).get_network_details())
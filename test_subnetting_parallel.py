@@ -0,0 +1,23 @@
+from subnetting import CIDR, VLSM
+from subnetting_parallel import plan_parallel
+
+JOBS = [
+    {"mode": "CIDR", "ip_mask": "192.168.1.0/24", "extra_input": 4},
+    {"mode": "VLSM", "ip_mask": "192.168.1.0/24", "extra_input": "60,30,10"},
+    {"mode": "CIDR", "ip_mask": "192.168.1.0/24", "extra_input": 1000},
+    {"mode": "CIDR", "ip_mask": "10.0.0.0/8", "extra_input": 3},
+]
+
+
+def test_plan_parallel_ordered():
+    results = list(plan_parallel(JOBS, workers=2, chunk_size=1))
+    assert [index for index, _, _ in results] == [0, 1, 2, 3]
+    assert results[0][1].to_dicts() == CIDR("192.168.1.0", 24).calculate_subnets(4)
+    assert results[1][1].to_dicts() == VLSM("192.168.1.0", 24).calculate_subnets([60, 30, 10])
+    assert results[2][1] is None and isinstance(results[2][2], ValueError)
+    assert len(results[3][1]) == 3
+
+
+def test_plan_parallel_unordered():
+    results = plan_parallel(JOBS * 5, workers=2, chunk_size=3, ordered=False, max_pending=2)
+    assert sorted(index for index, _, _ in results) == list(range(20))
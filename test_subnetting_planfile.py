@@ -0,0 +1,60 @@
+import pytest
+
+from subnetting import CIDR, VLSM
+from subnetting_cli import main
+from subnetting_planfile import PlanFile, PlanWriter, write_plan
+
+
+def test_write_and_open_cidr_plan(tmp_path):
+    path = tmp_path / "links.snplan"
+    assert write_plan(path, CIDR("10.0.0.0", 16), 16384, chunk_size=1000) == 16384
+    expected = CIDR("10.0.0.0", 16).subnet_table(16384)
+    with PlanFile(path) as plan:
+        assert (plan.mode, plan.network, list(plan.requirements), plan.packed) == ("CIDR", "10.0.0.0/16", [16384], False)
+        assert len(plan) == 16384
+        assert plan[5] == CIDR("10.0.0.0", 16).details(expected.networks[5], 30)
+        assert plan[-1]["Địa chỉ mạng"] == "10.0.255.252/30"
+        assert plan[100:110].networks == expected.networks[100:110]
+        assert plan[::4096].prefixes.tolist() == [30] * 4
+        assert plan.index_of("10.0.1.6") == 65 and "10.1.0.0" not in plan
+        assert plan.to_table().networks == expected.networks
+
+
+def test_vlsm_header_and_records(tmp_path):
+    path = tmp_path / "vlsm.snplan"
+    write_plan(path, VLSM("192.168.1.0", 24, packed=True), [10, 60, 30])
+    with PlanFile(path) as plan:
+        assert (plan.mode, plan.packed, list(plan.requirements)) == ("VLSM", True, [60, 30, 10])
+        assert [row["Địa chỉ mạng"] for row in plan] == ["192.168.1.0/26", "192.168.1.64/27", "192.168.1.96/28"]
+
+
+def test_writer_rejects_unordered_and_reader_rejects_garbage(tmp_path):
+    with PlanWriter(tmp_path / "bad.snplan", "10.0.0.0", 24, "CIDR", [2]) as writer:
+        writer.write(["10.0.0.128/25"])
+        with pytest.raises(ValueError):
+            writer.write(["10.0.0.0/25"])
+    with PlanFile(tmp_path / "bad.snplan") as plan:
+        assert len(plan) == 1
+    (tmp_path / "junk.snplan").write_bytes(b"not a plan file at all, definitely not")
+    with pytest.raises(ValueError):
+        PlanFile(tmp_path / "junk.snplan")
+
+
+def test_cli_exports_plan_file(tmp_path):
+    path = tmp_path / "cli.snplan"
+    assert main(["--mode", "CIDR", "--ip-mask", "10.0.0.0/8", "--extra-input", "1024", "-o", str(path)]) == 0
+    with PlanFile(path) as plan:
+        assert len(plan) == 1024 and plan.index_of("10.255.255.255") == 1023
+
+
+def test_failed_write_leaves_no_plan_file(tmp_path):
+    path = tmp_path / "partial.snplan"
+    with pytest.raises(RuntimeError):
+        with PlanWriter(path, "10.0.0.0", 24, "CIDR", [2]) as writer:
+            writer.write(["10.0.0.0/25"])
+            raise RuntimeError
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ValueError):
+        PlanWriter(path, "10.0.0.0", 24, "VLSM", [10, -5])
+    assert main(["--mode", "VLSM", "--ip-mask", "10.0.0.0/24", "--extra-input", "10,-5", "-o", str(path)]) == 1
+    assert list(tmp_path.iterdir()) == []
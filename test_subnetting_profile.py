@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+import subnetting_profile
+from subnetting import CIDR, VLSM, Subnetting
+
+
+def test_disabled_leaves_hot_paths_untouched():
+    details = Subnetting.__dict__["details"]
+    with subnetting_profile.profile():
+        assert Subnetting.__dict__["details"] is not details
+    assert Subnetting.__dict__["details"] is details
+    assert subnetting_profile.active() is None
+    with subnetting_profile.span("noop"):
+        subnetting_profile.count("noop")
+
+
+def test_profile_collects_timers_counters_and_trace(tmp_path):
+    json_path, trace_path = tmp_path / "run.json", tmp_path / "run.trace.json"
+    with subnetting_profile.profile(json_path, trace_path) as profiler:
+        CIDR("192.168.0.0", 16).calculate_subnets(64)
+        VLSM("10.0.0.0", 24).calculate_subnets([60, 30, 10])
+        with subnetting_profile.span("custom"):
+            subnetting_profile.count("rows", 3)
+
+    report = json.loads(json_path.read_text(encoding="utf-8"))
+    assert report["timers"]["Subnetting.details"]["calls"] == 67
+    assert report["timers"]["Subnetting.__init__"]["calls"] == 2
+    assert report["timers"]["CIDR.subnet_table"]["calls"] == 1
+    assert report["counters"] == {"rows": 3}
+    assert "custom" in report["allocated_blocks"]
+
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    names = {event["name"] for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert {"CIDR.subnet_table", "VLSM.subnet_table", "custom"} <= names
+    assert "Subnetting.details" not in names
+    assert profiler.to_dict()["timers"]["Subnetting.details"]["calls"] == 67
+
+
+def test_environment_variable_writes_reports(tmp_path):
+    prefix = tmp_path / "env"
+    code = "from subnetting import CIDR; CIDR('10.0.0.0', 8).calculate_subnets(4)"
+    env = dict(os.environ, SUBNETTING_PROFILE=str(prefix))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env, cwd=os.path.dirname(__file__))
+    report = json.loads((tmp_path / "env.json").read_text(encoding="utf-8"))
+    assert report["timers"]["Subnetting.details"]["calls"] == 4
+    assert json.loads((tmp_path / "env.trace.json").read_text(encoding="utf-8"))["traceEvents"]
@@ -0,0 +1,55 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from subnetting import CIDR, VLSM
+from subnetting_server import PlanningServer, request
+
+
+async def call(server, path, payload):
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    try:
+        status, body = await request(reader, writer, server.host, path, payload)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return status, json.loads(body)
+
+
+def run_with_server(scenario):
+    async def main():
+        server = PlanningServer("127.0.0.1", 0, executor=ThreadPoolExecutor(2))
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_endpoints_and_errors():
+    async def scenario(server):
+        status, body = await call(server, "/cidr", {"ip_mask": "192.168.1.0/24", "extra_input": 4})
+        assert status == 200 and body["subnets"] == CIDR("192.168.1.0", 24).calculate_subnets(4)
+        status, body = await call(server, "/vlsm", {"ip_mask": "192.168.1.0/24", "extra_input": "60,30,10"})
+        assert status == 200 and body["subnets"] == VLSM("192.168.1.0", 24).calculate_subnets([60, 30, 10])
+        status, again = await call(server, "/vlsm", {"ip_mask": "192.168.1.99/24", "extra_input": [10, 60, 30]})
+        assert status == 200 and again == body and server.cache.stats()["hits"] == 1
+        status, body = await call(server, "/details", {"ip_mask": "10.1.2.3/8"})
+        assert status == 200 and body["Địa chỉ mạng"] == "10.0.0.0/8"
+        status, body = await call(server, "/cidr", {"ip_mask": "192.168.1.0/33", "extra_input": 4})
+        assert status == 400 and "error" in body
+        status, _ = await call(server, "/nope", {})
+        assert status == 404
+    run_with_server(scenario)
+
+
+def test_identical_requests_are_coalesced_and_streamed():
+    async def scenario(server):
+        payload = {"ip_mask": "10.0.0.0/8", "extra_input": 20000}
+        results = await asyncio.gather(*(call(server, "/cidr", payload) for _ in range(5)))
+        assert all(status == 200 for status, _ in results)
+        assert len(results[0][1]["subnets"]) == 20000
+        assert results[0][1]["subnets"][-1] == CIDR("10.0.0.0", 8).calculate_subnets(20000)[-1]
+        assert server.coalesced >= 1
+    run_with_server(scenario)
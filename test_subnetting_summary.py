@@ -0,0 +1,40 @@
+import ipaddress
+import random
+
+from subnetting import SubnetTable
+from subnetting_summary import summarize, _summarize_python
+
+
+def random_prefixes(count, seed):
+    rng = random.Random(seed)
+    prefixes = []
+    for _ in range(count):
+        prefix = rng.randint(20, 32)
+        prefixes.append(((0x0A000000 + rng.randrange(1 << 16)) & ~((1 << (32 - prefix)) - 1), prefix))
+    return prefixes
+
+
+def test_summarize_matches_collapse_addresses():
+    for seed in range(5):
+        prefixes = random_prefixes(500, seed)
+        summary = summarize(prefixes)
+        expected = ipaddress.collapse_addresses(ipaddress.IPv4Network(prefix) for prefix in prefixes)
+        assert [f"{ipaddress.IPv4Address(n)}/{p}" for n, p in zip(summary.table.networks, summary.table.prefixes)] \
+            == [str(network) for network in expected]
+        assert summary.over_coverage == 0
+
+        python_table, covered = _summarize_python(SubnetTable.from_prefixes(prefixes), None)
+        assert list(python_table.networks) == list(summary.table.networks)
+        assert covered == summary.covered
+
+
+def test_summarize_with_max_prefix_reports_over_coverage():
+    summary = summarize(["192.168.1.0/25", "192.168.1.128/26", "192.168.3.0/24", "10.0.0.0/8"])
+    assert summary.table.to_dicts()[1]["Địa chỉ mạng"] == "192.168.1.0/25"
+    assert len(summary.table) == 4
+
+    summary = summarize(["192.168.1.0/25", "192.168.1.128/26", "192.168.3.0/24", "10.0.0.0/8"], max_prefix=22)
+    assert [row["Địa chỉ mạng"] for row in summary.table] == ["10.0.0.0/8", "192.168.0.0/22"]
+    assert summary.covered == (1 << 24) + 128 + 64 + 256
+    assert summary.over_coverage == 1024 - 448
+    assert _summarize_python(SubnetTable.from_prefixes(["192.168.1.0/25", "192.168.3.0/24"]), 22)[0].prefixes[0] == 22
@@ -0,0 +1,42 @@
+import pytest
+
+from subnetting import CIDR, VLSM
+from subnetting_v6 import CIDR6, VLSM6
+
+
+def test_cidr6_plan_is_lazy_random_access():
+    plan = CIDR6("2001:db8::", 32).plan(1 << 32)
+    assert len(plan) == 1 << 32
+    assert plan[0]["Địa chỉ mạng"] == "2001:db8::/64"
+    assert plan[-1]["Địa chỉ mạng"] == "2001:db8:ffff:ffff::/64"
+    assert plan[0x12345]["Dải địa chỉ"] == "2001:db8:1:2345:: - 2001:db8:1:2345:ffff:ffff:ffff:ffff"
+    assert plan.index_of("2001:db8:1:2345::42") == 0x12345
+
+    window = plan[10:1 << 31:1 << 20]
+    assert len(window) == 2048
+    assert window.index_of(plan[10 + (5 << 20)]["Địa chỉ mạng"]) == 5
+    with pytest.raises(ValueError):
+        window.index_of("2001:db8::b:0:0:1")
+
+
+def test_vlsm6_plan():
+    plan = VLSM6("2001:db8:abcd::", 48).plan([200, 1 << 64, 1 << 64, 70])
+    assert [subnet["Địa chỉ mạng"] for subnet in plan] == [
+        "2001:db8:abcd::/64", "2001:db8:abcd:1::/64", "2001:db8:abcd:2::/120", "2001:db8:abcd:2::100/121",
+    ]
+    assert plan.index_of("2001:db8:abcd:2::142") == 3
+    with pytest.raises(ValueError):
+        VLSM6("2001:db8::", 120).plan([300])
+
+
+def test_ipv4_plans_match_engine():
+    plan = CIDR("10.0.0.0", 8).plan(1000000)
+    assert len(plan) == 1000000
+    assert plan[123456] == CIDR("10.0.0.0", 8).subnet_table(1000000)[123456].to_dict()
+    assert plan.index_of("10.30.36.5") == 123456
+
+    requirements = [10, 60, 30, 2, 2, 500]
+    plan = VLSM("10.0.0.0", 16).plan(list(requirements))
+    assert list(plan) == VLSM("10.0.0.0", 16).calculate_subnets(list(requirements))
+    assert [plan.index_of(subnet["Địa chỉ broadcast"]) for subnet in plan] == list(range(len(requirements)))
+    assert plan[2:4].to_table().to_dicts() == list(plan)[2:4]
@@ -1,17 +1,317 @@
 import sys
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QTextEdit, QWidget, QMessageBox, QGraphicsScene, QGraphicsView, QGraphicsTextItem, QGraphicsLineItem, QGraphicsPixmapItem, QFileDialog, QDialog
+    QApplication, QMainWindow, QVBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QCheckBox, QTextEdit, QWidget, QMessageBox, QGraphicsScene, QGraphicsView, QGraphicsItem, QFileDialog, QDialog, QProgressBar, QTableView, QHeaderView
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPen, QPixmap, QFont
-from math import cos, sin, radians
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal, QAbstractTableModel, QModelIndex, QRectF, QPointF
+from array import array
+from PyQt5.QtGui import QPen, QPixmap, QFont, QColor, QPainter
+from math import cos, sin, radians, sqrt, ceil
 from subnetting import *
+from subnetting_engine import plan_tables
+from subnetting_export import export, guess_format
+from subnetting_planfile import PLAN_SUFFIX, PlanFile, PlanWriter
+import subnetting_profile
+
+CHUNK_ROWS = 4096
+FILTER_ROWS = 65536
+FRAME_MS = 16
+FILTER_DELAY_MS = 250
+
+SWITCHES_PER_ROUTER = 3
+SWITCH_RADIUS = 100
+CELL_WIDTH = 320
+CELL_HEIGHT = 280
+ICON_LOD = 0.25
+LABEL_LOD = 0.6
+
+_PIXMAPS = {}
+
+def scaled_pixmap(path, width, height):
+    key = (path, width, height)
+    pixmap = _PIXMAPS.get(key)
+    if pixmap is None:
+        pixmap = _PIXMAPS[key] = QPixmap(path).scaled(width, height)
+    return pixmap
+
+class PlanWorker(QObject):
+    chunk_ready = pyqtSignal(int, object)
+    progress = pyqtSignal(int, int, int)
+    failed = pyqtSignal(int, str)
+    finished = pyqtSignal(int, bool, bool)
+
+    def __init__(self, run_id, planner, argument, total):
+        super().__init__()
+        self.run_id = run_id
+        self.planner = planner
+        self.argument = argument
+        self.total = total
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        done = 0
+        failed = False
+        try:
+            for table in plan_tables(self.planner, self.argument, chunk_size=CHUNK_ROWS):
+                if self.cancelled:
+                    break
+                done += len(table)
+                self.chunk_ready.emit(self.run_id, table)
+                self.progress.emit(self.run_id, done, self.total)
+        except Exception as e:
+            # Mọi lỗi trong luồng tính toán đều phải báo về để giao diện không bị treo ở trạng thái đang chạy
+            failed = True
+            self.failed.emit(self.run_id, str(e))
+        finally:
+            self.finished.emit(self.run_id, self.cancelled, failed)
+
+class SubnetTableModel(QAbstractTableModel):
+    HEADERS = ("Mạng con",) + DETAIL_KEYS
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table = SubnetTable()
+        self.order = None
+        self.sort_column = 0
+        self.sort_order = Qt.AscendingOrder
+        self.filter_text = ""
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.table) if self.order is None else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        source = self.source_row(index.row())
+        column = index.column()
+        if role == Qt.DisplayRole:
+            # Chỉ định dạng ô đang được hiển thị
+            if column == 0:
+                return source + 1
+            return self.table[source][self.HEADERS[column]]
+        if role == Qt.TextAlignmentRole and column in (0, len(self.HEADERS) - 1):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def source_row(self, row):
+        return row if self.order is None else self.order[row]
+
+    def clear(self):
+        self.beginResetModel()
+        self.table = SubnetTable()
+        self.order = self._build_order()
+        self.endResetModel()
+
+    def append(self, table):
+        start = len(self.table)
+        self.table.networks.extend(table.networks)
+        self.table.prefixes.extend(table.prefixes)
+        if self.sort_column != 0 or self.sort_order != Qt.AscendingOrder:
+            self.beginResetModel()
+            self.order = self._build_order()
+            self.endResetModel()
+            return
+        rows = range(start, len(self.table)) if self.order is None else self._matches(start, len(self.table))
+        if not len(rows):
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        if self.order is not None:
+            self.order.extend(rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self.order = self._build_order()
+        self.layoutChanged.emit()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip().lower()
+        self.beginResetModel()
+        self.order = self._build_order()
+        self.endResetModel()
+
+    def _matches(self, start, stop):
+        rows = array('l')
+        text = self.filter_text
+        for chunk_start in range(start, stop, FILTER_ROWS):
+            chunk = self.table[chunk_start:min(stop, chunk_start + FILTER_ROWS)]
+            for i, subnet in enumerate(chunk.to_dicts(), chunk_start):
+                if any(text in str(value).lower() for value in subnet.values()):
+                    rows.append(i)
+        return rows
+
+    def _sort_keys(self):
+        if self.sort_column in (1, 2):
+            return self.table.networks
+        if self.sort_column == 3:
+            return self.table.broadcasts()
+        if self.sort_column == 4:
+            return self.table.num_hosts()
+        return None
+
+    def _build_order(self):
+        keys = self._sort_keys()
+        descending = self.sort_order == Qt.DescendingOrder
+        if not self.filter_text and keys is None and not descending:
+            return None
+        rows = self._matches(0, len(self.table)) if self.filter_text else range(len(self.table))
+        if keys is not None:
+            rows = sorted(rows, key=keys.__getitem__, reverse=descending)
+        elif descending:
+            rows = reversed(rows)
+        return array('l', rows)
+
+    def view_table(self):
+        if self.order is None:
+            return self.table
+        return SubnetTable(array('I', (self.table.networks[i] for i in self.order)),
+                           array('B', (self.table.prefixes[i] for i in self.order)))
+
+    def iter_rows(self):
+        count = self.rowCount()
+        for start in range(0, count, FILTER_ROWS):
+            stop = min(count, start + FILTER_ROWS)
+            if self.order is None:
+                chunk = self.table[start:stop]
+                numbers = range(start + 1, stop + 1)
+            else:
+                sources = self.order[start:stop]
+                chunk = SubnetTable(array('I', (self.table.networks[i] for i in sources)),
+                                    array('B', (self.table.prefixes[i] for i in sources)))
+                numbers = (i + 1 for i in sources)
+            yield from zip(numbers, chunk.to_dicts())
+
+class TopologyItem(QGraphicsItem):
+    def __init__(self, subnets):
+        super().__init__()
+        self.subnets = subnets
+        self.num_routers = (len(subnets) + SWITCHES_PER_ROUTER - 1) // SWITCHES_PER_ROUTER
+        # Các router được xếp theo lưới gần vuông, lưới lớn dần theo số mạng con
+        self.columns = max(1, ceil(sqrt(self.num_routers)))
+        self.rows = max(1, ceil(self.num_routers / self.columns))
+        self.switch_offsets = [
+            (SWITCH_RADIUS * cos(radians(100 * k - 70)), SWITCH_RADIUS * sin(radians(100 * k - 70)))
+            for k in range(SWITCHES_PER_ROUTER)
+        ]
+        self.router_pixmap = scaled_pixmap("router.png", 80, 60)
+        self.switch_pixmap = scaled_pixmap("switch.png", 70, 45)
+        self.backbone_pen = QPen(Qt.black, 2, Qt.DashLine)
+        self.link_pen = QPen(Qt.black, 2)
+        self.router_font = QFont("Arial", 12, QFont.Bold)
+        self.switch_font = QFont("Arial", 10, QFont.Bold)
+        self.network_font = QFont("Arial", 10)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.columns * CELL_WIDTH, self.rows * CELL_HEIGHT)
+
+    def router_pos(self, r):
+        return (r % self.columns) * CELL_WIDTH + CELL_WIDTH / 2, (r // self.columns) * CELL_HEIGHT + 130
+
+    def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        rect = option.exposedRect
+
+        # Chỉ vẽ các ô nằm trong vùng đang hiển thị (thêm một ô vì đường nối
+        # router được vẽ sang ô bên trái hoặc bên trên)
+        first_column = max(0, int(rect.left() // CELL_WIDTH))
+        last_column = min(self.columns - 1, int(rect.right() // CELL_WIDTH) + 1)
+        first_row = max(0, int(rect.top() // CELL_HEIGHT))
+        last_row = min(self.rows - 1, int(rect.bottom() // CELL_HEIGHT) + 1)
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                r = row * self.columns + column
+                if r >= self.num_routers:
+                    break
+                self.paint_router(painter, r, lod)
+
+    def paint_router(self, painter, r, lod):
+        x_router, y_router = self.router_pos(r)
+        first = r * SWITCHES_PER_ROUTER
+        switches = range(first, min(len(self.subnets), first + SWITCHES_PER_ROUTER))
+
+        # Vẽ đường nối giữa các router
+        painter.setPen(self.backbone_pen)
+        if r % self.columns:
+            painter.drawLine(QPointF(x_router - CELL_WIDTH, y_router), QPointF(x_router, y_router))
+        elif r:
+            painter.drawLine(QPointF(x_router, y_router - CELL_HEIGHT), QPointF(x_router, y_router))
+
+        # Vẽ đường nối giữa router và switch
+        painter.setPen(self.link_pen)
+        for i in switches:
+            dx, dy = self.switch_offsets[i - first]
+            painter.drawLine(QPointF(x_router, y_router), QPointF(x_router + dx, y_router + dy))
+
+        if lod < ICON_LOD:
+            painter.fillRect(QRectF(x_router - 40, y_router - 30, 80, 60), QColor("#2E86C1"))
+            for i in switches:
+                dx, dy = self.switch_offsets[i - first]
+                painter.fillRect(QRectF(x_router + dx - 35, y_router + dy - 25, 70, 45), QColor("#5cb85c"))
+            return
+
+        painter.drawPixmap(QPointF(x_router - 40, y_router - 30), self.router_pixmap)
+        for i in switches:
+            dx, dy = self.switch_offsets[i - first]
+            painter.drawPixmap(QPointF(x_router + dx - 35, y_router + dy - 25), self.switch_pixmap)
+        if lod < LABEL_LOD:
+            return
+
+        # Nhãn chỉ được vẽ khi phóng to đủ để đọc được
+        painter.setFont(self.router_font)
+        painter.drawText(QPointF(x_router - 30, y_router + 58), f"Router {r + 1}")
+        for i in switches:
+            dx, dy = self.switch_offsets[i - first]
+            x_switch, y_switch = x_router + dx, y_router + dy
+            painter.setFont(self.switch_font)
+            painter.drawText(QPointF(x_switch - 30, y_switch + 45), f"Switch {i + 1}")
+            painter.setFont(self.network_font)
+            painter.drawText(QPointF(x_switch - 50, y_switch + 65), f"Net: {self.subnets[i][NETWORK_KEY]}")
+
+class TopologyView(QGraphicsView):
+    def __init__(self, scene=None, parent=None):
+        super().__init__(parent)
+        if scene is not None:
+            self.setScene(scene)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setRenderHint(QPainter.Antialiasing, False)
+
+    def wheelEvent(self, event):
+        factor = 1.15 ** (event.angleDelta().y() / 120)
+        scale = self.transform().m11() * factor
+        if 0.02 <= scale <= 4:
+            self.scale(factor, factor)
 
 class SubnettingApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Subnetting Tool")
         self.setGeometry(200, 200, 900, 700)
+        self.run_id = 0
+        self.worker = None
+        self.planner = None
+        self.host_requirements = None
+        self.threads = []
+        self.pending = []
+        self.running = False
         self.initUI()
 
     def initUI(self):
@@ -92,6 +392,10 @@ class SubnettingApp(QMainWindow):
         layout.addWidget(self.algorithm_label)
         layout.addWidget(self.algorithm_combo)
 
+        self.packed_check = QCheckBox("VLSM: đóng gói tối ưu (cấp khối nhỏ nhất vừa đủ cho mỗi yêu cầu)")
+        self.packed_check.setFont(QFont("Arial", 11))
+        layout.addWidget(self.packed_check)
+
         # Input IP and mask
         self.input_label = QLabel("Nhập địa chỉ IP và mặt nạ mạng (VD: 192.168.1.0/24):")
         self.input_label.setFont(QFont("Arial", 12))
@@ -122,6 +426,18 @@ class SubnettingApp(QMainWindow):
         self.run_button.clicked.connect(self.run_algorithm)
         layout.addWidget(self.run_button)
 
+        # Cancel button
+        self.cancel_button = QPushButton("Hủy")
+        self.cancel_button.setFont(QFont("Arial", 12, QFont.Bold))
+        self.cancel_button.setStyleSheet("background-color: #d9534f; color: white; border-radius: 5px;")
+        self.cancel_button.clicked.connect(self.cancel_run)
+        self.cancel_button.hide()
+        layout.addWidget(self.cancel_button)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
         # Export button
         self.export_button = QPushButton("Xuất file kết quả")
         self.export_button.setFont(QFont("Arial", 12, QFont.Bold))
@@ -139,30 +455,59 @@ class SubnettingApp(QMainWindow):
         layout.addWidget(self.topology_button)
 
         # Output area
-        self.output_area = QTextEdit()
+        self.filter_field = QLineEdit()
+        self.filter_field.setFont(QFont("Arial", 12))
+        self.filter_field.setPlaceholderText("Lọc kết quả (địa chỉ, dải, số host...)")
+        layout.addWidget(self.filter_field)
+
+        self.model = SubnetTableModel(self)
+        self.output_area = QTableView()
         self.output_area.setFont(QFont("Consolas", 12))
         self.output_area.setStyleSheet("background-color: #f9f9f9; border: 1px solid #ccc;")
-        self.output_area.setReadOnly(True)
+        self.output_area.setModel(self.model)
+        self.output_area.setSortingEnabled(True)
+        self.output_area.sortByColumn(0, Qt.AscendingOrder)
+        self.output_area.verticalHeader().hide()
+        self.output_area.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.output_area.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.output_area.horizontalHeader().setStretchLastSection(True)
+        self.output_area.setWordWrap(False)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(lambda: self.model.set_filter(self.filter_field.text()))
+        self.filter_field.textChanged.connect(self.filter_timer.start)
         self.guidance_area = QTextEdit()
         self.guidance_area.setReadOnly(True)
         layout.addWidget(self.output_area)
         layout.addWidget(self.guidance_area)
 
         # Network Topology Visualization
-        self.topology_view = QGraphicsView()
         self.scene = QGraphicsScene()
-        self.topology_view.setScene(self.scene)
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.topology_view = TopologyView(self.scene)
         self.topology_view.setStyleSheet("border: 1px solid #ccc; background-color: #e9ecef;")
         layout.addWidget(self.topology_view)
         self.topology_view.hide()
 
+        # Hiển thị kết quả theo từng khung hình để giao diện không bị đứng
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(FRAME_MS)
+        self.render_timer.timeout.connect(self.render_pending)
+
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
 
     def load_from_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Chọn file", "", "Text Files (*.txt);;All Files (*)")
-        if file_path:
+        file_path, _ = QFileDialog.getOpenFileName(self, "Chọn file", "", f"Text Files (*.txt);;Kế hoạch (*{PLAN_SUFFIX});;All Files (*)")
+        if file_path.lower().endswith(PLAN_SUFFIX):
+            try:
+                self.load_plan(file_path)
+            except ValueError as e:
+                QMessageBox.warning(self, "Lỗi", str(e))
+        elif file_path:
             try:
                 with open(file_path, 'r', encoding='utf-8') as file:
                     lines = file.readlines()
@@ -186,6 +531,29 @@ class SubnettingApp(QMainWindow):
             except Exception as e:
                 QMessageBox.warning(self, "Lỗi", str(e))
 
+    def load_plan(self, file_path):
+        # Nạp lại kết quả đã lưu: chỉ sao chép các bản ghi từ tệp ánh xạ bộ nhớ, không tính lại
+        with PlanFile(file_path) as plan:
+            table = plan.to_table()
+            mode, network, packed = plan.mode, plan.network, plan.packed
+            requirements = list(plan.requirements)
+        ip, mask = network.split('/')
+        self.algorithm_combo.setCurrentText(mode)
+        self.input_field.setText(network)
+        self.extra_input_field.setText(", ".join(map(str, requirements)))
+        self.packed_check.setChecked(packed)
+        self.planner = CIDR(ip, mask) if mode == "CIDR" else VLSM(ip, mask, packed)
+        self.host_requirements = requirements
+
+        self.cancel_run()
+        self.run_id += 1
+        self.model.clear()
+        self.scene.clear()
+        self.guidance_area.setPlainText(f"Đã nạp {len(table)} mạng con của {network} ({mode}) từ {file_path}.")
+        self.pending = [table]
+        self.running = True
+        self.on_finished(self.run_id, False)
+
     def run_algorithm(self):
         algorithm = self.algorithm_combo.currentText()
         ip_mask = self.input_field.text().strip()
@@ -243,8 +611,18 @@ class SubnettingApp(QMainWindow):
             mask = int(mask)
             if algorithm == "CIDR":
                 num_subnets = int(extra_input)
+            elif algorithm == "VLSM":
+                host_requirements = list(map(int, extra_input.split(',')))
+        except ValueError:
+            QMessageBox.warning(self, "Lỗi", "Chưa nhập yêu cầu!")
+            return
+
+        # Yêu cầu đã đọc được: lỗi phía dưới (ví dụ không đủ địa chỉ) được báo nguyên văn
+        try:
+            if algorithm == "CIDR":
                 cidr = CIDR(ip, mask)
-                subnets = cidr.calculate_subnets(num_subnets)
+                cidr.split_prefix(num_subnets)
+                planner, argument, size = cidr, num_subnets, num_subnets
                 network_address = cidr.network_address
                 broadcast_address = cidr.broadcast_address 
                 total = 1 << (32 - mask)
@@ -268,9 +646,10 @@ class SubnettingApp(QMainWindow):
                 )
                                     
             elif algorithm == "VLSM":
-                host_requirements = list(map(int, extra_input.split(',')))
-                vlsm = VLSM(ip, mask)
-                subnets = vlsm.calculate_subnets(host_requirements)
+                vlsm = VLSM(ip, mask, self.packed_check.isChecked())
+                vlsm.sort_requirements(host_requirements)
+                self.host_requirements = host_requirements
+                planner, argument, size = vlsm, host_requirements, len(host_requirements)
                 network_address = vlsm.network_address
                 broadcast_address = vlsm.broadcast_address 
                 
@@ -288,108 +667,146 @@ class SubnettingApp(QMainWindow):
                     f"Bước 4: Chia mạng theo thứ tự yêu cầu được sắp xếp lại theo thứ tự {', '.join(map(str, host_requirements))}.\n"
                     f"*Chú ý: Với VLSM, nếu giữa 2 yêu cầu chỉ chêch lệch 1 bit\n   Chúng ta sẽ không chia mà cấp luôn mạng con phía trước."
                 )
+                if vlsm.packed:
+                    guidance = guidance.rsplit("\n*Chú ý", 1)[0] + (
+                        "\n*Chế độ đóng gói: mỗi yêu cầu được cấp khối nhỏ nhất vừa đủ, "
+                        "các khối cùng kích thước được xếp liền nhau."
+                    )
 
 
-            self.display_output(subnets)            
+            self.start_run(planner, argument, size)
             self.guidance_area.setPlainText(guidance)
             font = QFont("Arial", 10)
             self.guidance_area.setFont(font)
-            self.export_button.show()
-            self.topology_button.show() 
 
         except ValueError as e:
-            QMessageBox.warning(self, "Lỗi", "Chưa nhập yêu cầu!")
-
-    def display_output(self, subnets):
-        self.output_area.clear()
-        for i, subnet in enumerate(subnets):
-            self.output_area.append(f"Mạng con {i + 1}:")
-            for key, value in subnet.items():
-                self.output_area.append(f"  {key}: {value}")
-            self.output_area.append("")
-
-        self.visualize_topology(subnets)
+            QMessageBox.warning(self, "Lỗi", str(e))
+
+    def start_run(self, planner, argument, total):
+        # Lần chạy mới thay thế lần chạy cũ còn đang tính toán
+        self.cancel_run()
+        self.run_id += 1
+        self.pending = []
+        self.running = True
+        self.model.clear()
+        self.scene.clear()
+        self.export_button.hide()
+        self.topology_button.hide()
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cancel_button.show()
+
+        self.planner = planner
+        thread = QThread(self)
+        worker = PlanWorker(self.run_id, planner, argument, total)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.chunk_ready.connect(self.on_chunk)
+        worker.progress.connect(self.on_progress)
+        worker.failed.connect(self.on_failed)
+        worker.finished.connect(self.on_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(self.cleanup_threads)
+        self.threads.append((thread, worker))
+        self.worker = worker
+        thread.start()
+        self.render_timer.start()
+
+    def cancel_run(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def cleanup_threads(self):
+        self.threads = [(thread, worker) for thread, worker in self.threads if not thread.isFinished()]
+
+    def on_chunk(self, run_id, table):
+        if run_id == self.run_id:
+            self.pending.append(table)
+
+    def on_progress(self, run_id, done, total):
+        if run_id == self.run_id:
+            self.progress_bar.setValue(done)
+
+    def on_failed(self, run_id, message):
+        if run_id == self.run_id:
+            QMessageBox.warning(self, "Lỗi", message)
+
+    def on_finished(self, run_id, cancelled, failed=False):
+        if run_id != self.run_id:
+            return
+        self.running = False
+        self.worker = None
+        self.cancel_button.hide()
+        self.progress_bar.hide()
+        self.render_pending()
+        if not cancelled and not failed and len(self.model.table):
+            if isinstance(self.planner, VLSM):
+                usage = self.planner.usage(self.host_requirements, self.model.table)
+                self.guidance_area.append(
+                    f"\nHiệu suất sử dụng: {usage['utilization']:.1%}, lãng phí {usage['wasted_addresses']} địa chỉ host, "
+                    f"còn trống {usage['free_addresses']} địa chỉ."
+                )
+            self.visualize_topology(self.model.table)
+            self.export_button.show()
+            self.topology_button.show()
+
+    def render_pending(self):
+        # Gộp các phần kết quả nhận được trong một khung hình thành một lần chèn
+        if self.pending:
+            table = SubnetTable()
+            for chunk in self.pending:
+                table.networks.extend(chunk.networks)
+                table.prefixes.extend(chunk.prefixes)
+            self.pending = []
+            self.model.append(table)
+        if not self.running:
+            self.render_timer.stop()
 
     def visualize_topology(self, subnets):
         self.scene.clear()
-
-        center_x, center_y = 450, 300
-        router_radius = 150
-        switch_radius = 100
-
-        router_pixmap = QPixmap("router.png").scaled(80, 60)
-        switch_pixmap = QPixmap("switch.png").scaled(70, 45)
-
-        num_subnets = len(subnets)
-        max_switches_per_router = 3
-
-        num_routers = (num_subnets + max_switches_per_router - 1) // max_switches_per_router
-
-        routers = []
-
-        # Tạo các router và đặt vị trí của chúng
-        for r in range(num_routers):
-            x_router = center_x + router_radius * (r * 2 - num_routers + 1)
-            y_router = center_y
-
-            router_item = QGraphicsPixmapItem(router_pixmap)
-            router_item.setPos(x_router - 40, y_router - 30)
-            self.scene.addItem(router_item)
-
-            router_label = QGraphicsTextItem(f"Router {r + 1}")
-            router_label.setFont(QFont("Arial", 12, QFont.Bold))
-            router_label.setPos(x_router - 30, y_router + 40)
-            self.scene.addItem(router_label)
-
-            routers.append((x_router, y_router))
-
-        # Vẽ đường nối giữa các router
-        for r in range(num_routers - 1):
-            x_router1, y_router1 = routers[r]
-            x_router2, y_router2 = routers[r + 1]
-
-            line = QGraphicsLineItem(x_router1, y_router1, x_router2, y_router2)
-            line.setPen(QPen(Qt.black, 2, Qt.DashLine))
-            self.scene.addItem(line)
-
-        # Phân bố switch cho từng router
-        for i, subnet in enumerate(subnets):
-            router_index = i // max_switches_per_router
-            x_router, y_router = routers[router_index]
-
-            switch_angle = radians(100 * (i % max_switches_per_router) - 70) 
-            x_switch = x_router + switch_radius * cos(switch_angle)
-            y_switch = y_router + switch_radius * sin(switch_angle)
-
-            switch_item = QGraphicsPixmapItem(switch_pixmap)
-            switch_item.setPos(x_switch - 35, y_switch - 25)
-            self.scene.addItem(switch_item)
-
-            switch_label = QGraphicsTextItem(f"Switch {i + 1}")
-            switch_label.setFont(QFont("Arial", 10, QFont.Bold))
-            switch_label.setPos(x_switch - 30, y_switch + 30)
-            self.scene.addItem(switch_label)
-
-            # Vẽ đường nối giữa router và switch
-            line = QGraphicsLineItem(x_router, y_router, x_switch, y_switch)
-            line.setPen(QPen(Qt.black, 2))
-            self.scene.addItem(line)
-
-            # Hiển thị thông tin mạng của switch
-            network_address = subnet.get('Địa chỉ mạng', 'N/A')
-            network_label = QGraphicsTextItem(f"Net: {network_address}")
-            network_label.setFont(QFont("Arial", 10))
-            network_label.setPos(x_switch - 50, y_switch + 50)
-            self.scene.addItem(network_label)
+        topology = TopologyItem(subnets)
+        self.scene.addItem(topology)
+        self.scene.setSceneRect(topology.boundingRect())
 
     def export_results(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, "Lưu kết quả", "", "Text Files (*.txt);;All Files (*)")
-        if file_path:               
+        file_path, selected = QFileDialog.getSaveFileName(
+            self, "Lưu kết quả", "",
+            "CSV (*.csv *.csv.gz);;JSON (*.json *.json.gz);;JSON Lines (*.jsonl *.jsonl.gz);;Text Files (*.txt);;"
+            f"Kế hoạch (*{PLAN_SUFFIX});;All Files (*)"
+        )
+        if file_path:
+            if file_path.lower().endswith(PLAN_SUFFIX) or selected.startswith("Kế hoạch"):
+                # Tệp kế hoạch lưu toàn bộ kết quả theo thứ tự cấp phát, không theo bộ lọc/sắp xếp đang hiển thị
+                if not file_path.lower().endswith(PLAN_SUFFIX):
+                    file_path += PLAN_SUFFIX
+                mode = "CIDR" if isinstance(self.planner, CIDR) else "VLSM"
+                requirements = [len(self.model.table)] if mode == "CIDR" else self.host_requirements
+                with PlanWriter(file_path, self.planner.ip, self.planner.mask, mode, requirements,
+                                getattr(self.planner, "packed", False)) as writer:
+                    writer.write(self.model.table)
+            elif file_path.lower().endswith(".txt") or selected.startswith("Text"):
                 with open(file_path, 'w', encoding='utf-8') as file:
                     file.write(self.guidance_area.toPlainText())
                     file.write("\n\n\n Kết quả chia mạng: \n\n")
-                    file.write(self.output_area.toPlainText())
-                QMessageBox.information(self, "Thành công", f"Kết quả đã được lưu tại: {file_path}")
+                    for number, subnet in self.model.iter_rows():
+                        file.write(f"Mạng con {number}:\n")
+                        for key, value in subnet.items():
+                            file.write(f"  {key}: {value}\n")
+                        file.write("\n")
+            else:
+                default = {"JSON Lines": "jsonl", "JSON": "json"}.get(selected.partition(" (")[0], "csv")
+                export(self.model.view_table(), file_path, guess_format(file_path, default))
+            QMessageBox.information(self, "Thành công", f"Kết quả đã được lưu tại: {file_path}")
+
+    def closeEvent(self, event):
+        self.cancel_run()
+        for thread, _ in self.threads:
+            thread.quit()
+            thread.wait()
+        super().closeEvent(event)
 
     def show_topology(self):    
         topology_dialog = TopologyDialog(self.scene, self)
@@ -405,14 +822,23 @@ class TopologyDialog(QDialog):
         layout = QVBoxLayout()
 
         # Thêm GraphicsView để hiển thị scene
-        self.topology_view = QGraphicsView()
-        self.topology_view.setScene(scene)
+        self.topology_view = TopologyView(scene)
         self.topology_view.setStyleSheet("border: 1px solid #ccc; background-color: #e9ecef;")
         layout.addWidget(self.topology_view)
 
         # Đặt layout cho QDialog
         self.setLayout(layout)
 
+# Các giai đoạn của giao diện được đo khi bật SUBNETTING_PROFILE hoặc subnetting_profile.profile()
+subnetting_profile.register(PlanWorker, "run")
+subnetting_profile.register(SubnetTableModel, "append")
+subnetting_profile.register(SubnetTableModel, "data", subnetting_profile.HOT)
+subnetting_profile.register(SubnettingApp, "render_pending")
+subnetting_profile.register(SubnettingApp, "on_finished")
+subnetting_profile.register(SubnettingApp, "visualize_topology")
+subnetting_profile.register(SubnettingApp, "export_results")
+subnetting_profile.register(TopologyItem, "paint")
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = SubnettingApp()